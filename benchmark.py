@@ -0,0 +1,577 @@
+import argparse
+import gc
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import reportlab
+
+import generate_resume as gr
+import pdf_renderer
+
+# =============================================================================
+# CONSTANTS & CONFIG
+# =============================================================================
+
+DEFAULT_BULLET_SCALES = [10, 100, 1000, 10000]
+DEFAULT_AUDIENCE_SCALES = [1, 10, 100]
+
+# Laying out every audience of a 10,000-bullet document takes minutes, so only
+# this many audiences are rendered per scenario; totals are extrapolated.
+DEFAULT_MAX_RENDER = 3
+
+BULLETS_PER_JOB = 10
+
+# A stage only counts as regressed if it is this much slower in relative
+# and absolute terms than the baseline
+DEFAULT_THRESHOLD = 0.10
+MIN_REGRESSION_SECONDS = 0.001
+
+STAGES = [
+    "load",
+    "validate",
+    "build_model",
+    "collect_audiences",
+    "filter",
+    "variants",
+    "highlight",
+    "build_story",
+    "doc_build",
+]
+
+# Import-time budget of generate_resume (milliseconds, best of IMPORT_RUNS
+# fresh interpreters with the bytecode cached). Importing ReportLab or
+# compiling the term matcher at import time would exceed it. The single
+# source of the budget: --import-budget and tests/test_imports.py use it.
+IMPORT_BUDGET_MS = 100.0
+IMPORT_RUNS = 5
+
+# Commands that must run without ReportLab or the term tables
+LIGHT_COMMANDS = [["validate"], ["audiences"], ["stats"]]
+
+# Made-up terms added on top of tech_terms.json by the term-index benchmark,
+# and the synthetic bullets highlighted with and without them
+DEFAULT_CUSTOM_TERMS = 10000
+TERM_BENCH_BULLETS = 2000
+TERM_BENCH_RUNS = 5
+
+# Synthetic candidates in the skill-index benchmark, and the size of each
+DEFAULT_SKILL_FILES = 500
+SKILL_BENCH_BULLETS = 40
+SKILL_BENCH_AUDIENCES = 6
+
+FILLER_WORDS = [
+    "built", "designed", "migrated", "scaled", "optimized", "led", "shipped",
+    "a", "the", "platform", "service", "pipeline", "using", "with", "and",
+    "for", "latency", "throughput", "team", "customers", "reducing", "cost",
+]
+
+# =============================================================================
+# SYNTHETIC CONTENT
+# =============================================================================
+
+def _sentence(rng, words=18):
+    parts = []
+    for _ in range(words):
+        if rng.random() < 0.25:
+            parts.append(rng.choice(gr.TECH_TERMS))
+        else:
+            parts.append(rng.choice(FILLER_WORDS))
+    return " ".join(parts).capitalize() + "."
+
+def make_synthetic_content(n_bullets, n_audiences, seed=0):
+    """
+    Build a valid content document with n_bullets experience bullets spread
+    over jobs of BULLETS_PER_JOB, tagged across n_audiences audiences.
+    About one item in ten is universal; the rest target one to three audiences.
+    """
+    rng = random.Random(seed)
+    audiences = [f"audience{i:03d}" for i in range(n_audiences)]
+
+    def targets():
+        if rng.random() < 0.1:
+            return []
+        return rng.sample(audiences, min(len(audiences), rng.randint(1, 3)))
+
+    summary = [{"text": _sentence(rng, 40), "target_audiences": [aud]} for aud in audiences]
+    skills = [{"text": _sentence(rng, 30), "target_audiences": [aud]} for aud in audiences]
+
+    experience = []
+    for job_idx in range(0, n_bullets, BULLETS_PER_JOB):
+        count = min(BULLETS_PER_JOB, n_bullets - job_idx)
+        experience.append({
+            "title": f"Engineer {job_idx // BULLETS_PER_JOB}",
+            "company": f"Company {job_idx // BULLETS_PER_JOB}",
+            "dates": "Jan 2020 – Dec 2021",
+            "intro": _sentence(rng, 12),
+            "bullets": [{"text": _sentence(rng), "target_audiences": targets()} for _ in range(count)],
+        })
+
+    return {
+        "name": "Bench Mark",
+        "contact_info": {
+            "phone": "+1 555-0000",
+            "email": "bench@example.com",
+            "linkedin_url": "https://www.linkedin.com/in/bench/",
+            "github_url": "https://github.com/bench",
+        },
+        "summary": summary,
+        "skills": skills,
+        "experience": experience,
+        "education": "<b>B.Sc. in Computer Science</b>, Example University",
+        "languages": "English – Native",
+    }
+
+# =============================================================================
+# STAGE TIMING
+# =============================================================================
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def _all_texts(content):
+    texts = [item.text for item in content.summary]
+    for job in content.experience:
+        if job.intro.strip():
+            texts.append(job.intro)
+        texts.extend(bullet.text for bullet in job.bullets)
+    return texts
+
+def _collect(content):
+    index = content.index
+    return index, gr.collect_all_audiences(content, index)
+
+def _filter_all(content, index, audiences):
+    for audience in audiences:
+        index.select(content.summary, "summary", audience)
+        index.select(content.skills, "skills", audience)
+        for job_idx, job in enumerate(content.experience):
+            index.select(job.bullets, job_idx, audience)
+
+def _distinct_variants(index, audiences):
+    return len({index.selection(audience) for audience in audiences})
+
+def _highlight_all(texts):
+    for text in texts:
+        gr.format_text_with_bold_tech(text)
+
+def _doc_build(story):
+    doc = pdf_renderer.new_document(io.BytesIO(), gr.get_theme().pdf)
+    pdf_renderer.build_document(doc, story)
+
+def run_scenario(path, max_render):
+    """
+    Time every pipeline stage for the content file at path.
+    Filtering and grouping identical variants cover all audiences; story
+    building and doc.build cover the first max_render audiences and are
+    also extrapolated to the distinct variants.
+    """
+    stages = {}
+    gr.FORMAT_CACHE.entries.clear()
+    e2e_start = time.perf_counter()
+
+    with open(path, 'r', encoding='utf-8') as f:
+        data, stages["load"] = _timed(json.load, f)
+
+    validation, stages["validate"] = _timed(gr.validate_content, data)
+    if not validation.valid:
+        raise ValueError(f"Synthetic content failed validation: {validation.errors[0]}")
+    content, stages["build_model"] = _timed(gr.build_content, data)
+    del data
+
+    (index, found), stages["collect_audiences"] = _timed(_collect, content)
+    audiences = sorted(found) or ["General"]
+
+    _, stages["filter"] = _timed(_filter_all, content, index, audiences)
+    variants, stages["variants"] = _timed(_distinct_variants, index, audiences)
+    _, stages["highlight"] = _timed(_highlight_all, _all_texts(content))
+
+    rendered = audiences[:max_render]
+    stages["build_story"] = 0.0
+    stages["doc_build"] = 0.0
+    for audience in rendered:
+        story, seconds = _timed(gr.build_story, content, audience, None, index)
+        stages["build_story"] += seconds
+        _, seconds = _timed(_doc_build, story)
+        stages["doc_build"] += seconds
+
+    end_to_end = time.perf_counter() - e2e_start
+    per_render = (stages["build_story"] + stages["doc_build"]) / len(rendered)
+    estimated_total = end_to_end + per_render * max(variants - len(rendered), 0)
+
+    return {
+        "audiences_rendered": len(rendered),
+        "distinct_variants": variants,
+        "stages": stages,
+        "end_to_end": end_to_end,
+        "estimated_all_audiences": estimated_total,
+    }
+
+def measure_memory(path):
+    """
+    Bytes held by the content file at path as json.load dictionaries, and as
+    the Content built from them once the dictionaries are released (text
+    strings and the AudienceIndex included), traced with tracemalloc.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        raw = f.read()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        data = json.loads(raw)
+        dict_bytes = tracemalloc.get_traced_memory()[0]
+        content = gr.build_content(data)
+        del data
+        gc.collect()
+        content_bytes = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del content
+    return {"dict_bytes": dict_bytes, "content_bytes": content_bytes}
+
+def run_benchmarks(bullet_scales, audience_scales, max_render, repeat, seed):
+    """Run every (bullets, audiences) scenario, keeping the fastest of repeat runs per stage."""
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_bullets in bullet_scales:
+            for n_audiences in audience_scales:
+                content = make_synthetic_content(n_bullets, n_audiences, seed)
+                path = os.path.join(tmp, f"bench_{n_bullets}_{n_audiences}.json")
+                with open(path, 'w', encoding='utf-8') as f:
+                    json.dump(content, f)
+
+                best = None
+                for _ in range(repeat):
+                    run = run_scenario(path, max_render)
+                    if best is None:
+                        best = run
+                        continue
+                    for stage, seconds in run["stages"].items():
+                        best["stages"][stage] = min(best["stages"][stage], seconds)
+                    best["end_to_end"] = min(best["end_to_end"], run["end_to_end"])
+                    best["estimated_all_audiences"] = min(best["estimated_all_audiences"], run["estimated_all_audiences"])
+
+                best.update({"name": f"{n_bullets}b_{n_audiences}a", "bullets": n_bullets, "audiences": n_audiences})
+                best["memory"] = memory = measure_memory(path)
+                results.append(best)
+                print(f"✓ {best['name']:>12}: {best['end_to_end']:.3f}s end to end "
+                      f"({best['audiences_rendered']} of {n_audiences} audiences rendered); "
+                      f"{memory['dict_bytes'] / 1e6:.2f} MB as dicts, {memory['content_bytes'] / 1e6:.2f} MB as Content")
+    return results
+
+# =============================================================================
+# TERM INDEX
+# =============================================================================
+
+def _custom_terms(n_terms, seed):
+    rng = random.Random(seed)
+    suffixes = ["", " SDK", ".js", "DB", " Cloud", "-ML"]
+    terms = set()
+    while len(terms) < n_terms:
+        stem = "".join(rng.choice("bcdfghklmnprstvz") + rng.choice("aeiou") for _ in range(rng.randint(2, 4)))
+        terms.add(stem.capitalize() + rng.choice(suffixes))
+    return sorted(terms)
+
+def _highlight_per_bullet(texts):
+    """Fastest of TERM_BENCH_RUNS uncached passes over texts, in microseconds per text."""
+    best = None
+    for _ in range(TERM_BENCH_RUNS):
+        gr.FORMAT_CACHE.entries.clear()
+        _, seconds = _timed(_highlight_all, texts)
+        best = seconds if best is None else min(best, seconds)
+    return best / len(texts) * 1e6
+
+def benchmark_term_index(n_custom, seed):
+    """
+    Compile and load times of the term index for tech_terms.json alone and
+    with an overlay of n_custom made-up terms, and the per-bullet
+    highlighting time with each. Index files go to a temporary directory.
+    """
+    content = make_synthetic_content(TERM_BENCH_BULLETS, 1, seed)
+    texts = [bullet["text"] for job in content["experience"] for bullet in job["bullets"]]
+    results = {}
+    index_dir = gr.TERM_INDEX_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        overlay = os.path.join(tmp, "custom_terms.json")
+        with open(overlay, 'w', encoding='utf-8') as f:
+            json.dump({"terms": {"Custom": _custom_terms(n_custom, seed)}}, f)
+        gr.TERM_INDEX_DIR = os.path.join(tmp, "index")
+        try:
+            for name, overlays in (("base", []), (f"+{n_custom}", [overlay])):
+                paths = [gr.BASE_TERMS_PATH, *overlays]
+                _, compile_s = _timed(gr.load_term_index, paths)
+                index, load_s = _timed(gr.load_term_index, paths)
+                if not index.cached:
+                    raise RuntimeError(f"Term index for {name} was not saved to {gr.TERM_INDEX_DIR}")
+                gr.set_term_overlays(overlays)
+                gr.term_index()
+                results[name] = {
+                    "terms": len(index.terms) + len(index.aliases),
+                    "compile_ms": compile_s * 1000,
+                    "load_ms": load_s * 1000,
+                    "highlight_us_per_bullet": _highlight_per_bullet(texts),
+                }
+        finally:
+            gr.TERM_INDEX_DIR = index_dir
+            gr.set_term_overlays([])
+
+    for name, row in results.items():
+        print(f"✓ term index {name:>7}: {row['terms']} terms, compile {row['compile_ms']:.1f}ms, "
+              f"load {row['load_ms']:.1f}ms, highlight {row['highlight_us_per_bullet']:.1f}us/bullet")
+    return results
+
+# =============================================================================
+# SKILL INDEX
+# =============================================================================
+
+def _write_candidate(path, index, seed):
+    content = make_synthetic_content(SKILL_BENCH_BULLETS, SKILL_BENCH_AUDIENCES, seed)
+    content["name"] = f"Candidate {index}"
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(content, f)
+
+def _refresh(db, paths):
+    with gr.SkillIndex(db) as skills:
+        skills.update(paths)
+        return skills.totals()
+
+def benchmark_skill_index(n_files, seed):
+    """
+    Build a skill index over n_files synthetic candidates, refresh it with no
+    file changed and with one changed, and time a two-term query (best of
+    TERM_BENCH_RUNS) at each --within scope. Everything goes to a temporary
+    directory.
+    """
+    rng = random.Random(seed)
+    query_terms = rng.sample(gr.TECH_TERMS, 2)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [os.path.join(tmp, f"candidate_{i:05d}.json") for i in range(n_files)]
+        for i, path in enumerate(paths):
+            _write_candidate(path, i, seed + i)
+        db = os.path.join(tmp, "skills.sqlite")
+
+        totals, build_s = _timed(_refresh, db, paths)
+        _, unchanged_s = _timed(_refresh, db, paths)
+        _write_candidate(paths[0], 0, seed - 1)
+        _, changed_s = _timed(_refresh, db, paths)
+
+        query_ms = {}
+        with gr.SkillIndex(db) as skills:
+            for within in gr.SKILL_QUERY_SCOPES:
+                best = None
+                for _ in range(TERM_BENCH_RUNS):
+                    _, seconds = _timed(skills.query, query_terms, "audience000", within)
+                    best = seconds if best is None else min(best, seconds)
+                query_ms[within] = best * 1000
+        db_bytes = os.path.getsize(db)
+
+    result = {
+        "files": n_files,
+        "occurrences": totals["occurrences"],
+        "db_bytes": db_bytes,
+        "build_seconds": build_s,
+        "unchanged_seconds": unchanged_s,
+        "one_changed_seconds": changed_s,
+        "query_terms": query_terms,
+        "query_ms": query_ms,
+    }
+    print(f"✓ skill index {n_files} files: build {build_s:.2f}s, no change {unchanged_s * 1000:.1f}ms, "
+          f"one changed {changed_s * 1000:.1f}ms, {totals['occurrences']} occurrences, {db_bytes / 1e6:.1f} MB; "
+          + ", ".join(f"query {within} {ms:.1f}ms" for within, ms in query_ms.items()))
+    return result
+
+# =============================================================================
+# IMPORT TIME
+# =============================================================================
+
+# Run in a fresh interpreter: one command, then what it loaded and built
+_COMMAND_PROBE = """
+import sys
+import generate_resume as gr
+try:
+    gr.main(sys.argv[1:])
+except SystemExit:
+    pass
+print()
+print(gr.term_index.cache_info().currsize, any(m.startswith("reportlab") for m in sys.modules))
+"""
+
+def _python(args, cwd):
+    env = {key: value for key, value in os.environ.items() if key != "PYTHONDONTWRITEBYTECODE"}
+    env["PYTHONPATH"] = os.path.dirname(os.path.abspath(gr.__file__))
+    return subprocess.run([sys.executable, *args], cwd=cwd, env=env, capture_output=True, text=True, check=True)
+
+def measure_import_time(runs=IMPORT_RUNS):
+    """
+    Cumulative import time of generate_resume in milliseconds, as reported
+    by -X importtime, best of runs fresh interpreters. A first import writes
+    the bytecode cache, so compiling the source is not counted.
+    """
+    _python(["-c", "import generate_resume"], None)
+    best = None
+    for _ in range(runs):
+        stderr = _python(["-X", "importtime", "-c", "import generate_resume"], None).stderr
+        for line in stderr.splitlines():
+            fields = line.split("|")
+            if len(fields) == 3 and fields[2].strip() == "generate_resume":
+                ms = int(fields[1]) / 1000
+                best = ms if best is None else min(best, ms)
+    return best
+
+def probe_command(command):
+    """
+    Run one command on synthetic content in a fresh interpreter.
+    Returns (built the term matcher, imported ReportLab).
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, gr.JSON_FILENAME), 'w', encoding='utf-8') as f:
+            json.dump(make_synthetic_content(100, 5), f)
+        last_line = _python(["-c", _COMMAND_PROBE, *command], tmp).stdout.strip().splitlines()[-1]
+    patterns, reportlab_loaded = last_line.split()
+    return patterns != "0", reportlab_loaded == "True"
+
+def check_imports(budget_ms=IMPORT_BUDGET_MS, runs=IMPORT_RUNS):
+    """
+    Measure the import time against budget_ms and probe each LIGHT_COMMANDS
+    entry. Returns (import_ms, problems) where problems lists every failed check.
+    """
+    problems = []
+    import_ms = measure_import_time(runs)
+    if import_ms > budget_ms:
+        problems.append(f"import generate_resume took {import_ms:.1f}ms (budget {budget_ms:.1f}ms)")
+
+    for command in LIGHT_COMMANDS:
+        built_matcher, loaded_reportlab = probe_command(command)
+        if loaded_reportlab:
+            problems.append(f"'{' '.join(command)}' imported ReportLab")
+        if built_matcher:
+            problems.append(f"'{' '.join(command)}' built the tech term matcher")
+    return import_ms, problems
+
+# =============================================================================
+# BASELINE COMPARISON
+# =============================================================================
+
+def compare_to_baseline(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare stage and end-to-end timings with a saved baseline.
+    Returns a list of regressions: (scenario, stage, baseline_s, current_s, ratio).
+    """
+    previous = {run["name"]: run for run in baseline.get("results", [])}
+    regressions = []
+    for run in results:
+        old = previous.get(run["name"])
+        if old is None:
+            continue
+        pairs = [(stage, old["stages"].get(stage), run["stages"][stage]) for stage in STAGES]
+        pairs.append(("end_to_end", old.get("end_to_end"), run["end_to_end"]))
+        for stage, before, after in pairs:
+            if not before:
+                continue
+            ratio = after / before
+            if ratio > 1 + threshold and after - before > MIN_REGRESSION_SECONDS:
+                regressions.append((run["name"], stage, before, after, ratio))
+    return regressions
+
+# =============================================================================
+# MAIN EXECUTION
+# =============================================================================
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the resume generation pipeline on synthetic content.")
+    parser.add_argument("--bullets", type=int, nargs="+", default=DEFAULT_BULLET_SCALES,
+                        help="Bullet counts to benchmark (default: %(default)s).")
+    parser.add_argument("--audiences", type=int, nargs="+", default=DEFAULT_AUDIENCE_SCALES,
+                        help="Audience counts to benchmark (default: %(default)s).")
+    parser.add_argument("--max-render", type=int, default=DEFAULT_MAX_RENDER,
+                        help="Audiences actually laid out per scenario (default: %(default)s).")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="Runs per scenario; the fastest time per stage is kept (default: %(default)s).")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic content.")
+    parser.add_argument("--output", "-o", help="Write results as JSON to this file.")
+    parser.add_argument("--compare", metavar="BASELINE_JSON",
+                        help="Compare against a saved results file and exit 1 on regressions.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative slowdown that counts as a regression (default: %(default)s).")
+    parser.add_argument("--custom-terms", type=int, default=DEFAULT_CUSTOM_TERMS, metavar="N",
+                        help="Extra terms for the term-index benchmark; 0 skips it (default: %(default)s).")
+    parser.add_argument("--skill-files", type=int, default=DEFAULT_SKILL_FILES, metavar="N",
+                        help="Synthetic candidates for the skill-index benchmark; 0 skips it (default: %(default)s).")
+    parser.add_argument("--import-budget", type=float, default=IMPORT_BUDGET_MS, metavar="MS",
+                        help="Fail when importing generate_resume takes longer (default: %(default)s).")
+    parser.add_argument("--import-only", action="store_true",
+                        help="Only run the import-time and light-command checks (fast enough for every CI run).")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    print("--- Checking import time ---")
+    import_ms, import_problems = check_imports(args.import_budget)
+    if import_problems:
+        for problem in import_problems:
+            print(f"❌ {problem}")
+    else:
+        print(f"✓ import generate_resume: {import_ms:.1f}ms (budget {args.import_budget:.1f}ms); "
+              f"{', '.join(' '.join(c) for c in LIGHT_COMMANDS)} load neither ReportLab nor the term matcher")
+    if args.import_only:
+        if import_problems:
+            sys.exit(1)
+        return
+
+    print("\n--- Running benchmarks ---")
+    results = run_benchmarks(args.bullets, args.audiences, max(1, args.max_render), max(1, args.repeat), args.seed)
+    term_index = benchmark_term_index(args.custom_terms, args.seed) if args.custom_terms > 0 else None
+    skill_index = benchmark_skill_index(args.skill_files, args.seed) if args.skill_files > 0 else None
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "reportlab": reportlab.Version,
+            "platform": platform.platform(),
+            "tech_terms": len(gr.TECH_TERMS),
+            "import_ms": import_ms,
+            "max_render": args.max_render,
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": results,
+        "term_index": term_index,
+        "skill_index": skill_index,
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=4)
+        print(f"\n✓ Results written to {args.output}")
+    else:
+        print(json.dumps(report, indent=4))
+
+    if import_problems:
+        print(f"\n❌ Import checks failed ({len(import_problems)} problem(s), see above).")
+        sys.exit(1)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) against {args.compare}:")
+            for name, stage, before, after, ratio in regressions:
+                print(f"   {name} {stage}: {before * 1000:.2f}ms -> {after * 1000:.2f}ms ({ratio:.2f}x)")
+            sys.exit(1)
+        print(f"\n✓ No regressions against {args.compare} (threshold {args.threshold:.0%}).")
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,20 @@
+import hashlib
+import html
+import io
 import json
 import os
 import re
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
-from reportlab.lib.pagesizes import LETTER
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.units import inch
-from reportlab.lib.enums import TA_LEFT, TA_RIGHT
+from functools import lru_cache
+from html.parser import HTMLParser
+
+# ReportLab (via pdf_renderer), argparse, cProfile, archives, process pools,
+# http.server, glob and shutil are imported where they are used, so importing
+# this module and the validate/audiences/stats commands stay fast
 
 # =============================================================================
 # CONSTANTS & CONFIG
@@ -15,179 +22,646 @@ from reportlab.lib.enums import TA_LEFT, TA_RIGHT
 
 JSON_FILENAME = "content.json"
 
-# Expanded Tech Terms for Bold Formatting
-# Sorted by length (descending) to ensure "Spring Boot" matches before "Spring"
-TECH_TERMS = sorted([
-    # --- Languages (Modern & Legacy) ---
-    "JavaScript", "TypeScript", "Python", "Java", "Golang", "Go", "C++", "C#", "C", "Rust",
-    "Ruby", "PHP", "Swift", "Kotlin", "Objective-C", "Scala", "Elixir", "Haskell", "Lua",
-    "Dart", "Solidity", "Vyper", "Perl", "Groovy", "Clojure", "F#", "OCaml", "Erlang",
-    "Assembly", "VHDL", "Verilog", "R", "MATLAB", "Julia", "Bash", "Shell", "PowerShell",
-    "COBOL", "Fortran", "Pascal", "Ada", "Lisp", "Scheme", "Racket", "Smalltalk", "Tcl",
-    "Crystal", "Nim", "Zig", "ReasonML", "PureScript", "Elm", "Hack", "Visual Basic", "VBA",
-    "ActionScript", "ColdFusion", "Delphi", "Eiffel", "FoxPro", "LabVIEW", "Ladder Logic",
-    "Modula-2", "PL/SQL", "Transact-SQL", "T-SQL", "Simulink", "Standard ML", "Wolfram Language",
-    "Mathematica", "APL", "J", "PostScript", "Awk", "Sed", "XSLT", "XPath",
-
-    # --- Frontend & Web ---
-    "React", "React.js", "Next.js", "Vue", "Vue.js", "Angular", "Svelte", "Ember.js",
-    "Backbone.js", "jQuery", "Redux", "Jotai", "Zustand", "MobX", "Recoil", "Context API",
-    "React Query", "TanStack Query", "SWR", "Formik", "React Hook Form", "Webpack", "Vite",
-    "Parcel", "Rollup", "Babel", "ESBuild", "Bun", "Deno", "HTML", "HTML5", "CSS", "CSS3",
-    "Sass", "SCSS", "Less", "Stylus", "Tailwind", "Tailwind CSS", "Bootstrap", "Material-UI",
-    "MUI", "Chakra UI", "Ant Design", "Styled-Components", "Emotion", "Bulma", "Foundation",
-    "WebAssembly", "WASM", "WebGL", "Three.js", "D3.js", "Chart.js", "Highcharts",
-    "React Router", "Gatsby", "Nuxt.js", "Remix", "Astro", "SolidJS", "Qwik", "Alpine.js",
-    "Lit", "Stencil", "RxJS", "Zod", "Yup", "Immer", "Lodash", "Moment.js", "Date-fns",
-    "Handlebars", "Mustache", "Pug", "Jade", "EJS", "Liquid", "Nunjucks", "Smarty",
-    "Blade", "Twig", "Jinja2", "HTMX", "Hyperscript", "Pico.css", "DaisyUI", "Mantine",
-    "Headless UI", "Radix UI", "Shadcn", "Storybook", "Framer Motion", "GSAP", "Anime.js",
-    "Leaflet", "Mapbox", "OpenLayers", "Cesium", "Video.js", "Plyr", "Howler.js",
-
-    # --- Backend & Frameworks ---
-    "Node.js", "Express.js", "Spring", "Spring Boot", "Django", "Flask", "FastAPI",
-    "Ruby on Rails", "Laravel", "Symfony", "ASP.NET", ".NET", ".NET Core", "NestJS", "Koa",
-    "Hapi", "Meteor", "Phoenix", "Gin", "Echo", "Fiber", "Play Framework", "Hibernate",
-    "JPA", "Entity Framework", "Prisma", "TypeORM", "Sequelize", "Mongoose", "SQLAlchemy",
-    "CakePHP", "CodeIgniter", "Yii", "Zend", "Slim", "Sinatra", "Hanami", "Grails", "Dropwizard",
-    "Micronaut", "Quarkus", "Helidon", "Ktor", "Rocket", "Actix", "Axum", "Revel", "Beego",
-    "LoopBack", "Sails.js", "AdonisJS", "Feathers", "Moleculer", "Fastify", "Restify",
-    "Sanic", "Tornado", "Pyramid", "Bottle", "CherryPy", "Falcon", "Hug", "Masonite",
-    "Vapor", "Kitura", "Perfect", "Buffalo", "Martini", "Iris", "Chi", "Gorilla Mux",
-    "Vert.x", "Ratpack", "Spark Java", "Javalin", "Struts", "JSF", "Vaadin", "Wicket",
-    "Gails", "ColdBox", "Mojolicious", "Catalyst", "Dancer", "Plack", "Laminas", "Phalcon",
-
-    # --- Mobile & Desktop ---
-    "React Native", "Flutter", "Ionic", "Xamarin", "Expo", "Electron", "Tauri",
-    "SwiftUI", "UIKit", "Jetpack Compose", "Android SDK", "iOS SDK", "Cordova", "PhoneGap",
-    "NativeScript", "Capacitor", "Qt", "GTK", "WPF", "WinForms", "Cocoa", "Cocoa Touch",
-    "Maui", "Uno Platform", "Avalonia", "Kivy", "BeeWare", "Tkinter", "PyQt", "PySide",
-    "WxPython", "Fyne", "Gio", "Sciter", "NW.js", "Neutralinojs", "Proton Native",
-    "AppKit", "Carbon", "UWP", "WinUI", "MFC", "ATL", "VCL", "FireMonkey",
-
-    # --- Database & Data ---
-    "SQL", "MySQL", "PostgreSQL", "SQLite", "MariaDB", "MSSQL", "NoSQL", "MongoDB",
-    "Cassandra", "DynamoDB", "CouchDB", "Redis", "Memcached", "Elasticsearch", "Neo4j",
-    "ArangoDB", "Firebase", "Supabase", "Realm", "CockroachDB", "Snowflake", "BigQuery",
-    "Redshift", "Hadoop", "Spark", "Hive", "Kafka", "Apache Kafka", "RabbitMQ", "ActiveMQ",
-    "Pulsar", "SQS", "SNS", "Kinesis", "ZeroMQ", "NATS", "ClickHouse", "TimescaleDB",
-    "InfluxDB", "ScyllaDB", "HBase", "Teradata", "Oracle DB", "DB2", "Informix", "Sybase",
-    "Presto", "Trino", "Flink", "Storm", "Samza", "Beam", "Airflow", "Prefect", "Dagster",
-    "dbt", "ETL", "ELT", "Data Lake", "Data Warehouse",
-    "DuckDB", "Parquet", "Avro", "ORC", "Arrow", "Dremio", "Druid", "Pinot", "Kylin",
-    "Vertica", "Greenplum", "Netezza", "Exasol", "SingleStore", "TiDB", "YugabyteDB",
-    "FoundationDB", "RethinkDB", "RavenDB", "OrientDB", "JanusGraph", "TigerGraph",
-    "FaunaDB", "SurrealDB", "MeiliSearch", "Typesense", "Solr", "Lucene", "Algolia",
-    "Vector Database", "Pinecone", "Milvus", "Weaviate", "Chroma", "Qdrant",
-
-    # --- DevOps, Cloud & Infrastructure ---
-    "AWS", "Amazon Web Services", "Azure", "Google Cloud", "GCP", "Digital Ocean", "Heroku",
-    "Vercel", "Netlify", "Linode", "Cloudflare", "Akamai", "Docker", "Kubernetes", "K8s",
-    "Terraform", "Ansible", "Chef", "Puppet", "Vagrant", "Jenkins", "CircleCI", "Travis CI",
-    "GitLab CI", "GitHub Actions", "ArgoCD", "Bamboo", "TeamCity", "Prometheus", "Grafana",
-    "ELK Stack", "Splunk", "Datadog", "New Relic", "PagerDuty", "Nginx", "Apache", "HAProxy",
-    "Envoy", "Istio", "Linkerd", "Linux", "Ubuntu", "Debian", "CentOS", "Red Hat", "Fedora",
-    "Arch Linux", "Alpine", "Windows Server", "VirtualBox", "VMware", "OpenStack", "Openshift",
-    "Rancher", "Nomad", "Consul", "Vault", "Packer", "Pulumi", "Crossplane", "Helm", "Kustomize",
-    "Flux", "Tekton", "Spinnaker", "Nagios", "Zabbix", "Sentry", "Logstash", "Kibana", "Fluentd",
-    "Podman", "LXC", "LXD", "Mesos", "Marathon", "SaltStack", "Fabric", "Capistrano",
-    "Waypoint", "Bosh", "CloudFoundry", "AppEngine", "Lambda", "Fargate", "ECS", "EKS",
-    "AKS", "GKE", "Serverless Framework", "SAM", "CDK", "CloudFormation", "Bicep",
-    "Traefik", "Caddy", "Kong", "Tyk", "Ambassador", "Contour", "Gloo", "Cilium",
-    "Calico", "Flannel", "Weave Net", "CoreDNS", "Etcd", "ZooKeeper", "Thanপরেos",
-    "Cortex", "VictoriaMetrics", "Loki", "Tempo", "Jaeger", "Zipkin", "OpenTelemetry",
-    "Checkmk", "Icinga", "Netdata", "Glances", "Htop", "Strace", "Tcpdump",
-
-    # --- Testing & QA ---
-    "Jest", "Mocha", "Chai", "Cypress", "Puppeteer", "Playwright", "Selenium", "TestNG",
-    "JUnit", "PyTest", "RSpec", "Cucumber", "Appium", "Karma", "Jasmine", "Enzyme",
-    "Testing Library", "Vitest", "K6", "JMeter", "Gatling", "SonarQube", "Espresso", "XCTest",
-    "Detox", "Robot Framework", "Sauce Labs", "BrowserStack", "LoadRunner", "Locust",
-    "TestCafe", "Nightwatch.js", "WebdriverIO", "Protractor", "Ava", "Tape", "QUnit",
-    "Sinon", "Nock", "MSW", "WireMock", "Mountebank", "Postman Collections", "Newman",
-    "Allure", "ReportPortal", "TestRail", "Zephyr", "Xray", "Coveralls", "Codecov",
-    "Hypothesis", "Property-based Testing", "Fuzz Testing", "Chaos Monkey", "Gremlin",
-
-    # --- Web3 & Blockchain ---
-    "Web3.js", "Ethers.js", "Wagmi", "Viem", "Hardhat", "Truffle", "Foundry", "Ganache",
-    "Ethereum", "Solana", "Polygon", "Arbitrum", "Optimism", "Binance Smart Chain",
-    "Smart Contracts", "DeFi", "NFT", "DAO", "IPFS", "Filecoin", "Chainlink", "The Graph",
-    "Privy", "RainbowKit", "WalletConnect", "Metamask", "Phantom", "Gnosis Safe",
-    "Jupiter", "Uniswap", "GMX", "Aave", "Compound", "Curve", "Hyperliquid",
-    "Coingecko", "BirdEye", "DexScreener", "ERC-20", "ERC-721", "ERC-1155",
-    "Cosmos", "Polkadot", "Near", "Avalanche", "Fantom", "Tezos", "Cardano", "Ripple",
-    "Stellar", "Monero", "Zcash", "Algorand", "Hedera", "EVM", "Solc", "Slither", "MythX",
-    "OpenZeppelin", "Alchemy", "Infura", "Moralis", "Tenderly", "Dune Analytics",
-    "Rust (Solana)", "Anchor", "Sealevel", "Move", "Aptos", "Sui", "Cairo", "StarkNet",
-    "ZkSync", "Hermez", "Loopring", "Immutable X", "Mina", "Celestia", "EigenLayer",
-    "Lens Protocol", "Farcaster", "Arweave", "Thorchain", "CosmWasm", "Substrate",
-    "Ink!", "Clarity", "Cadence", "Flow", "Hyperledger", "Fabric", "Corda", "Quorum",
-
-    # --- Architecture & Concepts ---
-    "REST", "RESTful", "GraphQL", "Apollo", "gRPC", "Protobuf", "TRPC", "Socket.io",
-    "WebSockets", "Microservices", "Serverless", "Monolith", "Event-Driven", "TDD", "BDD",
-    "CI/CD", "OOP", "FP", "MVC", "MVVM", "SOLID", "DRY", "KISS", "YAGNI", "Agile", "Scrum",
-    "Kanban", "Waterfall", "DevOps", "GitOps", "Infrastructure as Code", "IaC", "OAuth",
-    "OAuth2", "OIDC", "JWT", "SAML", "LDAP", "SSO", "HTTPS", "SSL", "TLS", "SSH", "Cors",
-    "PWA", "SPA", "SSR", "SSG", "ISR", "Jamstack", "12-Factor App", "Clean Architecture",
-    "Hexagonal Architecture", "Domain-Driven Design", "DDD", "CQRS", "Event Sourcing",
-    "Actor Model", "Reactive Programming", "Functional Reactive Programming", "FRP",
-    "Design Patterns", "Singleton", "Factory", "Observer", "Strategy", "Decorator",
-    "Adapter", "Facade", "Proxy", "Command", "Iterator", "Template Method",
-    "Visitor", "Composite", "Bridge", "Flyweight", "Chain of Responsibility", "Mediator",
-    "Memento", "Interpreter", "Anti-patterns", "Code Smells", "Technical Debt",
-    "Refactoring", "Pair Programming", "Mob Programming", "Code Review", "Static Analysis",
-    "Dynamic Analysis", "Profiling", "Benchmarking", "Optimization", "Scalability",
-    "High Availability", "Fault Tolerance", "Disaster Recovery", "CAP Theorem", "ACID",
-    "Sharding", "Replication", "Partitioning", "Caching", "Load Balancing",
-    "Rate Limiting", "Throttling", "Circuit Breaker", "Bulkhead",
-    "Idempotency", "Consistency", "Availability", "Partition Tolerance",
-
-    # --- Tools & IDEs ---
-    "Git", "GitHub", "GitLab", "Bitbucket", "Jira", "Confluence", "Trello", "Asana", "Notion",
-    "Slack", "Discord", "Zoom", "Teams", "Figma", "Sketch", "Adobe XD", "Postman", "Insomnia",
-    "Swagger", "OpenAPI", "VS Code", "Visual Studio Code", "IntelliJ IDEA", "WebStorm",
-    "PyCharm", "Eclipse", "NetBeans", "Android Studio", "Xcode", "Vim", "Neovim", "Emacs",
-    "Nano", "Maven", "Gradle", "Ant", "Yarn", "NPM", "PNPM", "Pip", "Homebrew", "Chocolatey",
-    "Scoop", "Apt", "Yum", "Pacman", "Make", "CMake", "Bazel", "Ninja",
-    "Rider", "GoLand", "CLion", "RubyMine", "PhpStorm", "DataGrip", "AppCode",
-    "Sublime Text", "Atom", "Notepad++", "TextMate", "Kakoune", "Helix", "Micro",
-    "Tmux", "Zsh", "Fish", "Oh My Zsh", "Starship", "Direnv", "Nix", "NixOS", "Guix",
-    "Asdf", "Nvm", "Rbenv", "Pyenv", "SDKMAN", "Volta", "Fnm", "Corepack",
-    "Husky", "Lint-staged", "Commitizen", "Semantic Release", "Standard Version",
-    "Lerna", "Nx", "Turborepo", "Rush", "Pants", "Buck", "Please", "Taskfile",
-    "Just", "Rake", "Invoke", "Gulp", "Grunt", "Yeoman", "Cookiecutter",
-
-    # --- Security ---
-    "OWASP", "Penetration Testing", "Metasploit", "Burp Suite", "Wireshark", "Nmap", "Kali Linux",
-    "Snort", "Suricata", "Osquery", "Wazuh", "CrowdStrike", "Splunk ES", "Sentinel",
-    "ZAP", "Nessus", "Qualys", "OpenVAS", "ClamAV", "Yara", "Zeek", "Bro",
-    "ModSecurity", "Fail2Ban", "UFW", "Iptables", "Firewalld", "SELinux", "AppArmor",
-    "GPG", "PGP", "OpenSSL", "BoringSSL", "LibreSSL", "Keybase", "1Password", "LastPass",
-    "Bitwarden", "Vaultwarden", "KeePass", "KeePassXC", "Authy", "Google Authenticator",
-    "YubiKey", "Duo", "Okta", "Auth0", "Cognito", "Firebase Auth", "Clerk", "Supabase Auth",
-    "Magic Link", "WebAuthn", "FIDO", "FIDO2", "Passkeys", "RBAC", "ABAC", "PBAC",
-    "XSS", "CSRF", "SQL Injection", "RCE", "SSRF", "XXE", "IDOR", "Clickjacking",
-    "Man-in-the-Middle", "Phishing", "Social Engineering", "Ransomware", "Malware",
-    "Rootkit", "Bootkit", "Spyware", "Adware", "Trojan", "Worm", "Virus", "Botnet",
-    "DDoS", "Zero-day", "Exploit", "Payload", "Shellcode", "Reverse Engineering",
-    "Forensics", "Incident Response", "Threat Hunting", "Threat Intelligence",
-
-    # --- AI & ML ---
-    "OpenAI", "ChatGPT", "GPT-3", "GPT-4", "Claude", "Gemini", "LLM", "LangChain",
-    "TensorFlow", "PyTorch", "Keras", "Scikit-learn", "Pandas", "NumPy", "SciPy",
-    "Jupyter Notebook", "Hugging Face", "Copilot", "Midjourney", "Stable Diffusion",
-    "XGBoost", "LightGBM", "CatBoost", "OpenCV", "NLTK", "Spacy", "Gensim", "FastAI",
-    "LlamaIndex", "AutoGPT", "BabyAGI", "Pinecone", "ChromaDB", "Weaviate", "Milvus",
-    "Qdrant", "DeepSpeed", "Ray", "Horovod", "ONNX", "TensorRT", "OpenVINO",
-    "CoreML", "TFLite", "TFX", "MLflow", "Kubeflow", "Seldon", "BentoML", "Cortex",
-    "Streamlit", "Gradio", "Dash", "Shiny", "Bokeh", "Plotly", "Matplotlib", "Seaborn",
-    "Altair", "Folium", "Pydeck", "Kepler.gl", "FiftyOne", "Label Studio", "Prodigy",
-    "Roboflow", "YOLO", "R-CNN", "Mask R-CNN", "Faster R-CNN", "SSD", "RetinaNet",
-    "EfficientNet", "ResNet", "VGG", "Inception", "MobileNet", "Transformer", "BERT",
-    "RoBERTa", "DistilBERT", "ALBERT", "T5", "GPT-2", "Bloom", "Falcon", "Llama",
-    "Mistral", "Vicuna", "Guanaco", "WizardLM", "Orca", "Phi", "Qwen", "Yi"
-], key=len, reverse=True)
+# Highlighted markup is cached per text (LRU) and persisted between runs
+FORMAT_CACHE_FILENAME = ".format_cache.json"
+FORMAT_CACHE_SIZE = 4096
+
+# Per-audience content fingerprints from the last run, used by --incremental
+BUILD_MANIFEST_FILENAME = ".build_manifest.json"
+
+# Content files at least this large are parsed one experience entry at a
+# time instead of with a single json.load
+STREAMING_THRESHOLD_BYTES = 8 * 1024 * 1024
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# Summary written by --batch into the output directory
+BATCH_REPORT_FILENAME = "batch_report.json"
+
+# Archive formats accepted by --archive
+ARCHIVE_EXTENSIONS = (".zip", ".tar", ".tar.gz", ".tgz")
+
+# --serve defaults: bind address, queued-request limit and latency sample size
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8000
+SERVER_MAX_QUEUE = 16
+SERVER_LATENCY_WINDOW = 1000
+
+# --max-pages: bullets to drop are chosen by wrap() measurements; at most this
+# many real builds per audience confirm the result
+MAX_FIT_BUILDS = 3
+
+# --watch polls content.json this often (seconds). A change is rebuilt once
+# two consecutive polls agree, so a save caught half-written is skipped
+WATCH_INTERVAL = 0.25
+
+# Headings of the resume sections, in every output format
+SECTION_TITLES = {
+    "skills": "TECHNICAL SKILLS",
+    "experience": "PROFESSIONAL EXPERIENCE",
+    "education": "EDUCATION",
+    "languages": "LANGUAGES",
+}
+
+# Tech-term dictionary shipped with the script; --terms adds overlays on top
+TECH_TERMS_FILENAME = "tech_terms.json"
+BASE_TERMS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), TECH_TERMS_FILENAME)
+
+# Compiled term indexes (JSON), keyed by a hash of the dictionary files, so
+# later runs load the matcher instead of merging, sorting and compiling terms
+TERM_INDEX_DIR = ".term_index"
+
+# Inverted index of the tech terms in a roster of content files (SQLite),
+# kept by the index command or --skill-index and read by query
+SKILL_INDEX_FILENAME = ".skill_index.sqlite"
+
+# Timestamp of archive members with --reproducible when SOURCE_DATE_EPOCH is
+# unset: 2000-01-01, the creation date ReportLab's invariant mode gives PDFs.
+# Zip timestamps cannot go below ZIP_EPOCH (1980-01-01).
+REPRODUCIBLE_EPOCH = 946684800
+ZIP_EPOCH = 315532800
+
+# Layout defaults; any key can be overridden with --theme theme.json
+# Margins and column widths are in inches, sizes in points
+# font_file/font_bold_file are optional TrueType files registered under the
+# font/font_bold names; without them the built-in Helvetica faces are used
+# max_pages is the page budget of each PDF (None = unlimited, see --max-pages)
+# reproducible pins the creation date (SOURCE_DATE_EPOCH, else 2000-01-01)
+# and the document ID, so identical content renders to identical bytes
+# formats lists the files written per audience (keys of RENDERERS); the
+# first one is the primary output that reports and the manifest name
+DEFAULT_THEME = {
+    "font": "Helvetica",
+    "font_bold": "Helvetica-Bold",
+    "font_file": None,
+    "font_bold_file": None,
+    "name_size": 24,
+    "contact_size": 10,
+    "section_size": 11,
+    "body_size": 10,
+    "job_title_size": 11,
+    "color_primary": "#2C3E50",
+    "color_muted": "#7F8C8D",
+    "color_secondary": "#555555",
+    "color_rule": "#BDC3C7",
+    "color_link": "#005b96",
+    "margin_left": 0.5,
+    "margin_right": 0.5,
+    "margin_top": 0.4,
+    "margin_bottom": 0.4,
+    "header_name_width": 3.5,
+    "job_date_width": 2.0,
+    "max_pages": None,
+    "reproducible": False,
+    "formats": ["pdf"],
+}
+
+
+# =============================================================================
+# TECH TERM MATCHER
+# =============================================================================
+
+# Characters re.IGNORECASE matches to an ASCII letter they do not lower-case
+# to (İ, ı, the Kelvin sign, ſ); fold_term maps them before lower-casing
+_CASE_FOLDS = str.maketrans({"\u0130": "i", "\u0131": "i", "\u212a": "k", "\u017f": "s"})
+
+# Bump when the layout of a saved term index changes
+_TERM_INDEX_FORMAT = 2
+
+# Existing <b>...</b> runs and other markup tags are copied through untouched;
+# anything else not preceded by an ASCII letter or digit may start a term,
+# and group 3 runs to where the first word of such a term would end
+_MARKUP_OR_TERM_START = re.compile(
+    r"(<b>.*?</b>)|(<[^>]*>)|(?<![a-zA-Z0-9])(\S[a-zA-Z0-9]*)", re.IGNORECASE | re.DOTALL
+)
+
+# A term ends before one of these (or at the end of the text); with
+# re.IGNORECASE the characters in _CASE_FOLDS count as letters, as they do in
+# the lookbehind above
+_TERM_BOUNDARY = re.compile(r"[^a-zA-Z0-9]", re.IGNORECASE)
+
+def fold_term(text):
+    """The case-insensitive key of a spelling in the matcher's table."""
+    return text.lower() if text.isascii() else text.translate(_CASE_FOLDS).lower()
+
+def term_table(terms, aliases):
+    """
+    The matcher's lookup table. The folded spelling of every term and alias
+    maps to its canonical term. Each prefix that ends before a character
+    other than a letter or digit ("spring" of "spring boot", "c" and
+    "c+" of "c++") maps to "", so a scan stops at the first word that no
+    term continues with.
+    """
+    spellings = [*((term, term) for term in terms), *aliases.items()]
+    table = {}
+    for spelling, _ in spellings:
+        for pos in range(1, len(spelling)):
+            if _TERM_BOUNDARY.match(spelling, pos):
+                table.setdefault(fold_term(spelling[:pos]), "")
+    for spelling, term in spellings:
+        table[fold_term(spelling)] = term
+    return table
+
+class TermMatcher:
+    """
+    Finds dictionary terms in one left-to-right pass with dictionary lookups
+    instead of a compiled regex of every term, so loading it costs no more
+    than reading its table. Matching is case-insensitive, a term must not
+    be preceded or followed by an ASCII letter or digit, and the longest
+    term starting at a position wins ("Spring Boot" over "Spring").
+    """
+
+    def __init__(self, table):
+        self.table = table
+
+    def scan(self, text):
+        """
+        Yield (start, end, bold, term) for every match, left to right: bold
+        is True for an existing <b>...</b> run, term the canonical spelling
+        of a dictionary term; other markup tags are skipped.
+        """
+        table = self.table
+        fold = str.lower if text.isascii() else fold_term
+        pos = 0
+        while True:
+            match = _MARKUP_OR_TERM_START.search(text, pos)
+            if match is None:
+                return
+            start, end = match.span()
+            if match.lastindex != 3:
+                if match.lastindex == 1:
+                    yield start, end, True, None
+                pos = end
+                continue
+
+            # Extend word by word while the text still spells a prefix of
+            # some term, keeping the longest whole term
+            found = None
+            while True:
+                term = table.get(fold(text[start:end]))
+                if term:
+                    found = (end, term)
+                elif term is None or end == len(text):
+                    break
+                boundary = _TERM_BOUNDARY.search(text, end + 1)
+                end = boundary.start() if boundary else len(text)
+
+            if found is None:
+                pos = start + 1
+            else:
+                yield start, found[0], False, found[1]
+                pos = found[0]
+
+class TermIndex:
+    """
+    The merged tech-term dictionaries and their matcher. cached tells
+    whether the index was loaded from TERM_INDEX_DIR.
+    terms are the canonical spellings, longest first ("Spring Boot" before
+    "Spring"); aliases maps other spellings to them ("K8s" -> "Kubernetes").
+    Both are highlighted as written in the text.
+    """
+
+    def __init__(self, terms, aliases, categories, table):
+        self.terms = terms
+        self.aliases = aliases
+        self.categories = categories
+        self.matcher = TermMatcher(table)
+        payload = "\n".join([*terms, *(f"{alias}\t{term}" for alias, term in sorted(aliases.items()))])
+        self.terms_hash = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        self.cached = False
+
+def read_term_dictionary(path):
+    """Parse one dictionary file and check it against TERM_DICTIONARY_SCHEMA."""
+    with open(path, 'r', encoding='utf-8') as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{path}: invalid JSON: {e}") from None
+    result = ValidationResult()
+    TERM_DICTIONARY_VALIDATOR(data, result)
+    if not result.valid:
+        raise ValueError(f"{path}: " + "; ".join(result.errors))
+    return data
+
+def merge_term_dictionaries(dictionaries):
+    """
+    Merge (path, data) dictionaries in order. Each one first drops its
+    "remove" terms (and their aliases) from those before it, then adds its
+    terms and aliases. Spellings compare case-insensitively, like the
+    matcher, and the first one wins; an alias replaces a term it spells.
+    Returns (terms, aliases, categories) for TermIndex.
+    """
+    terms = {}
+    aliases = {}
+    for path, data in dictionaries:
+        removed = {term.lower() for term in data.get("remove", [])}
+        for key in removed:
+            terms.pop(key, None)
+        aliases = {key: entry for key, entry in aliases.items()
+                   if key not in removed and entry[1].lower() not in removed}
+
+        for category, entries in data.get("terms", {}).items():
+            for term in entries:
+                if not term.strip():
+                    raise ValueError(f"{path}: empty term in {category!r}")
+                terms.setdefault(term.lower(), (term, category))
+        for alias, target in data.get("aliases", {}).items():
+            if not alias.strip():
+                raise ValueError(f"{path}: empty alias for {target!r}")
+            aliases.setdefault(alias.lower(), (alias, target))
+
+    for key in aliases:
+        terms.pop(key, None)
+    unknown = [f"{alias!r} -> {target!r}" for alias, target in aliases.values() if target.lower() not in terms]
+    if unknown:
+        raise ValueError(f"Alias(es) of unknown terms: {', '.join(unknown)}")
+
+    return (
+        [term for term, _ in terms.values()],
+        {alias: terms[target.lower()][0] for alias, target in aliases.values()},
+        dict(terms.values()),
+    )
+
+def compile_term_index(paths):
+    """
+    Build the TermIndex of dictionary files paths (base first).
+    """
+    terms, aliases, categories = merge_term_dictionaries([(path, read_term_dictionary(path)) for path in paths])
+    terms = tuple(sorted(terms, key=len, reverse=True))
+    return TermIndex(terms, aliases, categories, term_table(terms, aliases))
+
+def _term_index_path(paths):
+    digest = hashlib.sha256(f"{_TERM_INDEX_FORMAT}".encode("utf-8"))
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return os.path.join(TERM_INDEX_DIR, digest.hexdigest() + ".json")
+
+def load_term_index(paths):
+    """
+    TermIndex for dictionary files paths (base first). The merged, sorted
+    terms, aliases and categories and the matcher's table are saved as JSON
+    to TERM_INDEX_DIR, keyed by the files' bytes, so later runs only read
+    that file: nothing is merged, sorted or compiled again. Editing any
+    file selects a new index. Raises OSError or ValueError for a missing or
+    invalid dictionary.
+    """
+    cache_path = _term_index_path(paths)
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            stored = json.load(f)
+        index = TermIndex(tuple(stored["terms"]), stored["aliases"], stored["categories"], stored["table"])
+        index.cached = True
+        return index
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    index = compile_term_index(paths)
+    stored = {
+        "terms": index.terms, "aliases": index.aliases, "categories": index.categories,
+        "table": index.matcher.table,
+    }
+    try:
+        os.makedirs(TERM_INDEX_DIR, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(stored, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+    return index
+
+# Overlay dictionaries from --terms, applied over BASE_TERMS_PATH in order
+_TERM_OVERLAYS = ()
+
+def set_term_overlays(paths):
+    """Use BASE_TERMS_PATH plus the overlay files paths from now on."""
+    global _TERM_OVERLAYS
+    _TERM_OVERLAYS = tuple(paths)
+    term_index.cache_clear()
+    FORMAT_CACHE.entries.clear()
+
+def term_dictionary_paths():
+    return [BASE_TERMS_PATH, *_TERM_OVERLAYS]
+
+# The term index is loaded on first use, so commands that never highlight
+# (validate, audiences, stats) never read the dictionaries
+
+@lru_cache(maxsize=None)
+def term_index():
+    """The TermIndex of the current dictionaries."""
+    return load_term_index(term_dictionary_paths())
+
+def tech_terms():
+    """All canonical tech terms, longest first."""
+    return term_index().terms
+
+def tech_term_matcher():
+    """The TermMatcher for every term and alias."""
+    return term_index().matcher
+
+def tech_terms_hash():
+    """Hash of the terms and aliases; keys the persisted format cache and fingerprints."""
+    return term_index().terms_hash
+
+def canonical_term(text):
+    """The dictionary term text spells (any case, or an alias), or None."""
+    return term_index().matcher.table.get(fold_term(text)) or None
+
+_LAZY_TERM_TABLES = {
+    "TECH_TERMS": tech_terms,
+    "TECH_TERM_MATCHER": tech_term_matcher,
+    "TECH_TERMS_HASH": tech_terms_hash,
+}
+
+def __getattr__(name):
+    """Module attributes TECH_TERMS, TECH_TERM_MATCHER and TECH_TERMS_HASH, loaded on first access."""
+    if name in _LAZY_TERM_TABLES:
+        return _LAZY_TERM_TABLES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# =============================================================================
+# FORMAT CACHE
+# =============================================================================
+
+class FormatCache:
+    """
+    Bounded LRU cache from raw text to formatted markup.
+    Entries are keyed by a hash of the text, so identical bullets shared by
+    several audiences are only highlighted once per run.
+    """
+
+    def __init__(self, maxsize=FORMAT_CACHE_SIZE, terms_hash=None):
+        self.maxsize = maxsize
+        self._terms_hash = terms_hash
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def terms_hash(self):
+        """Hash of the term list the entries were made with (default: tech_terms_hash())."""
+        return self._terms_hash or tech_terms_hash()
+
+    @staticmethod
+    def key(text):
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get(self, text):
+        """Return cached markup for text, or None on a miss."""
+        key = self.key(text)
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, text, formatted):
+        key = self.key(text)
+        self.entries[key] = formatted
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def stats(self):
+        total = self.hits + self.misses
+        hit_rate = self.hits / total if total else 0.0
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self.entries),
+            "maxsize": self.maxsize,
+            "hit_rate": hit_rate,
+        }
+
+    def load(self, path):
+        """
+        Load entries persisted by save().
+        The file is ignored if it was written for a different term list.
+        """
+        if not os.path.exists(path):
+            return 0
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return 0
+
+        if not isinstance(stored, dict) or stored.get("terms_hash") != self.terms_hash:
+            return 0
+
+        entries = stored.get("entries", {})
+        if not isinstance(entries, dict):
+            return 0
+        for key, formatted in list(entries.items())[-self.maxsize:]:
+            self.entries[key] = formatted
+        return len(self.entries)
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"terms_hash": self.terms_hash, "entries": self.entries}, f)
+
+FORMAT_CACHE = FormatCache()
+
+
+# =============================================================================
+# PROFILING
+# =============================================================================
+
+class Profiler:
+    """
+    Collects wall/CPU time per pipeline stage (optionally per audience),
+    counters and per-audience notes such as page counts and output size.
+    Enabled with --profile; when PROFILER is None every hook is a no-op.
+    """
+
+    def __init__(self, pstats_path=None, trace_path=None):
+        self.pstats_path = pstats_path
+        self.trace_path = trace_path
+        self.events = []
+        self.counters = {}
+        self.notes = {}
+        self.cprofile = None
+
+    @contextmanager
+    def stage(self, name, audience=None):
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            self.events.append({
+                "name": name,
+                "audience": audience,
+                "start": wall_start,
+                "wall": time.perf_counter() - wall_start,
+                "cpu": time.process_time() - cpu_start,
+                "pid": os.getpid(),
+            })
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def note(self, audience, key, value):
+        self.notes.setdefault(audience, {})[key] = value
+
+    def drain(self):
+        """Hand collected data to the parent process and reset (used by pool workers)."""
+        data = (self.events, self.counters, self.notes)
+        self.events, self.counters, self.notes = [], {}, {}
+        return data
+
+    def merge(self, data):
+        events, counters, notes = data
+        self.events.extend(events)
+        for name, n in counters.items():
+            self.count(name, n)
+        for audience, values in notes.items():
+            self.notes.setdefault(audience, {}).update(values)
+
+    def start(self):
+        if self.pstats_path:
+            import cProfile
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
+
+    def finish(self):
+        """Print the summary and write the pstats / trace files if requested."""
+        if self.cprofile is not None:
+            self.cprofile.disable()
+            self.cprofile.dump_stats(self.pstats_path)
+            print(f"✓ cProfile stats: {self.pstats_path}")
+        if self.trace_path:
+            self.write_chrome_trace(self.trace_path)
+            print(f"✓ Chrome trace: {self.trace_path}")
+        self.print_summary()
+
+    def print_summary(self):
+        totals = {}
+        for event in self.events:
+            total = totals.setdefault(event["name"], {"calls": 0, "wall": 0.0, "cpu": 0.0})
+            total["calls"] += 1
+            total["wall"] += event["wall"]
+            total["cpu"] += event["cpu"]
+
+        print("\n--- Profile: stages ---")
+        print(f"{'stage':<20}{'calls':>7}{'wall ms':>12}{'cpu ms':>12}")
+        for name, total in totals.items():
+            print(f"{name:<20}{total['calls']:>7}{total['wall'] * 1000:>12.2f}{total['cpu'] * 1000:>12.2f}")
+
+        per_audience = {}
+        for event in self.events:
+            if event["audience"] is not None:
+                per_audience.setdefault(event["audience"], {})[event["name"]] = event["wall"]
+        if per_audience:
+            print("\n--- Profile: audiences ---")
+            for audience in sorted(per_audience):
+                stages = ", ".join(f"{name} {wall * 1000:.1f}ms" for name, wall in per_audience[audience].items())
+                notes = ", ".join(f"{key} {value}" for key, value in sorted(self.notes.get(audience, {}).items()))
+                print(f"{audience}: {stages}" + (f" | {notes}" if notes else ""))
+
+        if self.counters:
+            print("\n--- Profile: counters ---")
+            for name in sorted(self.counters):
+                print(f"{name}: {self.counters[name]}")
+
+    def write_chrome_trace(self, path):
+        """Write complete ('X') events in Chrome trace-event format (chrome://tracing, Perfetto)."""
+        trace = []
+        for event in self.events:
+            entry = {
+                "name": event["name"] if event["audience"] is None else f"{event['name']} [{event['audience']}]",
+                "ph": "X",
+                "ts": event["start"] * 1_000_000,
+                "dur": event["wall"] * 1_000_000,
+                "pid": event["pid"],
+                "tid": event["pid"],
+                "args": {"cpu_ms": round(event["cpu"] * 1000, 3)},
+            }
+            if event["audience"] is not None:
+                entry["args"].update(self.notes.get(event["audience"], {}))
+            trace.append(entry)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": trace, "otherData": {"counters": self.counters}}, f)
+
+PROFILER = None
+_NO_PROFILE = nullcontext()
+
+def profile_stage(name, audience=None):
+    """Context manager timing a stage when profiling is on; free otherwise."""
+    if PROFILER is None:
+        return _NO_PROFILE
+    return PROFILER.stage(name, audience)
+
+def enable_profiler(pstats_path=None, trace_path=None):
+    global PROFILER
+    PROFILER = Profiler(pstats_path, trace_path)
+    return PROFILER
+
+
+# =============================================================================
+# THEME
+# =============================================================================
+
+class Theme:
+    """
+    Fonts, colors, sizes, margins and output settings shared by every format.
+    The ReportLab styles built from them (Theme.pdf) are created on the first
+    PDF render and reused for every document, so rendering another audience
+    or candidate costs nothing for styling and text-only runs never import
+    ReportLab.
+    """
+
+    def __init__(self, **overrides):
+        unknown = set(overrides) - set(DEFAULT_THEME)
+        if unknown:
+            raise ValueError(f"Unknown theme setting(s): {', '.join(sorted(unknown))}")
+        self.config = {**DEFAULT_THEME, **overrides}
+        cfg = self.config
+
+        unknown_formats = [fmt for fmt in cfg["formats"] if fmt not in RENDERERS]
+        if unknown_formats or not cfg["formats"]:
+            raise ValueError(
+                f"Unknown output format(s): {', '.join(unknown_formats) or '(none given)'} "
+                f"(use {', '.join(RENDERERS)})"
+            )
+        self.formats = tuple(cfg["formats"])
+        self.max_pages = cfg["max_pages"]
+        self.reproducible = cfg["reproducible"]
+        self._pdf = None
+
+    @property
+    def pdf(self):
+        """The theme's PdfStyles, built (registering its fonts) on first use."""
+        if self._pdf is None:
+            import pdf_renderer
+            self._pdf = pdf_renderer.PdfStyles(self.config)
+        return self._pdf
+
+    def fingerprint(self):
+        fonts = [_file_stamp(path) for path in (self.config["font_file"], self.config["font_bold_file"]) if path]
+        payload = json.dumps([self.config, fonts], sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def from_file(cls, path):
+        """Build a theme from a JSON file of DEFAULT_THEME overrides."""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(**json.load(f))
+
+_DEFAULT_THEME = None
+
+def get_theme():
+    """The process-wide theme, built on first use."""
+    global _DEFAULT_THEME
+    if _DEFAULT_THEME is None:
+        _DEFAULT_THEME = Theme()
+    return _DEFAULT_THEME
+
+def set_theme(theme):
+    global _DEFAULT_THEME
+    _DEFAULT_THEME = theme
 
 
 # =============================================================================
@@ -313,135 +787,722 @@ DEFAULT_CONTENT = {
 # VALIDATION HELPER FUNCTIONS
 # =============================================================================
 
-def validate_json_structure(data):
+# Declarative description of content.json, compiled once into CONTENT_VALIDATOR.
+# "type" is checked with isinstance, "keys" describes dictionary entries,
+# "items" describes every list element, "values" every value of a dictionary
+# with free-form keys, "collect_audiences" gathers the
+# strings of a target_audiences list while validating.
+NUMBER = (int, float)
+
+AUDIENCE_ITEM_SCHEMA = {
+    "type": dict,
+    "keys": {
+        "text": {"required": True},
+        "target_audiences": {"type": list, "items": {"type": str}, "collect_audiences": True},
+    },
+}
+
+# Bullets may carry a priority; --max-pages drops the lowest first
+BULLET_SCHEMA = {
+    "type": dict,
+    "keys": {**AUDIENCE_ITEM_SCHEMA["keys"], "priority": {"type": NUMBER}},
+}
+
+JOB_SCHEMA = {
+    "type": dict,
+    "keys": {
+        "title": {"required": True},
+        "company": {"required": True},
+        "dates": {"required": True},
+        "intro": {"type": str},
+        "bullets": {"required": True, "type": list, "items": BULLET_SCHEMA},
+    },
+}
+
+CONTENT_SCHEMA = {
+    "type": dict,
+    "keys": {
+        "name": {"required": True},
+        "contact_info": {
+            "required": True,
+            "type": dict,
+            "keys": {
+                "phone": {"required": True, "type": str},
+                "email": {"required": True, "type": str},
+                "linkedin_url": {"type": str},
+                "github_url": {"type": str},
+            },
+        },
+        "summary": {"required": True, "type": list, "items": AUDIENCE_ITEM_SCHEMA},
+        "skills": {"required": True, "type": list, "items": AUDIENCE_ITEM_SCHEMA},
+        "experience": {"required": True, "type": list, "items": JOB_SCHEMA},
+        "education": {"required": True},
+        "languages": {"required": True},
+    },
+}
+
+TYPE_NAMES = {dict: "an object", list: "a list", str: "a string", NUMBER: "a number"}
+
+class ValidationResult:
+    """Errors (as '$.json.path: message' strings) and the audiences seen while validating."""
+
+    def __init__(self, max_errors=None):
+        self.errors = []
+        self.audiences = set()
+        self.max_errors = max_errors
+        self.truncated = False
+
+    @property
+    def valid(self):
+        return not self.errors
+
+    def error(self, path, message):
+        self.errors.append(f"{_render_path(path)}: {message}")
+        if self.max_errors is not None and len(self.errors) >= self.max_errors:
+            self.truncated = True
+            raise _ErrorLimitReached()
+
+class _ErrorLimitReached(Exception):
+    pass
+
+def _render_path(path):
+    """Paths are built as (parent, key) pairs and only turned into text for errors."""
+    parts = []
+    while path is not None:
+        path, key = path
+        parts.append(f"[{key}]" if isinstance(key, int) else f".{key}")
+    return "$" + "".join(reversed(parts))
+
+def _emit_check(spec, var, path, lines, depth, names):
+    """
+    Append Python source that checks the value held in variable var.
+    path is source for a (parent, key) tuple; it is only evaluated on error.
+    """
+    pad = "    " * depth
+    expected = spec.get("type")
+    if expected is not None:
+        type_name = names.setdefault(expected, f"T{len(names)}")
+        lines.append(f"{pad}if not isinstance({var}, {type_name}):")
+        lines.append(f"{pad}    error({path}, {('must be ' + TYPE_NAMES[expected])!r})")
+        lines.append(f"{pad}else:")
+        depth += 1
+        pad = "    " * depth
+    body_start = len(lines)
+
+    for key, sub in spec.get("keys", {}).items():
+        sub_path = f"({path}, {key!r})"
+        if "type" not in sub:
+            # Presence-only key: nothing to check on the value itself
+            if sub.get("required"):
+                lines.append(f"{pad}if {key!r} not in {var}:")
+                lines.append(f"{pad}    error({path}, {'missing required key ' + repr(key)!r})")
+            continue
+        child = f"v{depth}_{len(lines)}"
+        lines.append(f"{pad}if {key!r} in {var}:")
+        lines.append(f"{pad}    {child} = {var}[{key!r}]")
+        _emit_check(sub, child, sub_path, lines, depth + 1, names)
+        if sub.get("required"):
+            lines.append(f"{pad}else:")
+            lines.append(f"{pad}    error({path}, {'missing required key ' + repr(key)!r})")
+
+    if "items" in spec:
+        idx, item = f"i{depth}", f"item{depth}"
+        lines.append(f"{pad}for {idx}, {item} in enumerate({var}):")
+        loop_start = len(lines)
+        _emit_check(spec["items"], item, f"({path}, {idx})", lines, depth + 1, names)
+        if spec.get("collect_audiences"):
+            lines.append(f"{pad}    if isinstance({item}, str):")
+            lines.append(f"{pad}        add_audience({item})")
+        elif len(lines) == loop_start:
+            lines.append(f"{pad}    pass")
+
+    if "values" in spec:
+        key, value = f"k{depth}", f"val{depth}"
+        lines.append(f"{pad}for {key}, {value} in {var}.items():")
+        loop_start = len(lines)
+        _emit_check(spec["values"], value, f"({path}, {key})", lines, depth + 1, names)
+        if len(lines) == loop_start:
+            lines.append(f"{pad}    pass")
+
+    if len(lines) == body_start and expected is not None:
+        lines.append(f"{pad}pass")
+
+def compile_schema(spec):
+    """
+    Generate and compile a validator function for a schema dictionary.
+    The generated code is a straight-line walk with inlined isinstance checks,
+    so validation costs about as much as a hand-written check.
+    Returns check(value, result, path=None); path locates value inside a
+    larger document when only part of it is being checked.
+    """
+    lines = []
+    names = {}
+    _emit_check(spec, "value", "path", lines, 1, names)
+    source = "def check(value, result, path=None):\n"
+    source += "    error = result.error\n"
+    source += "    add_audience = result.audiences.add\n"
+    source += "\n".join(lines) + "\n"
+    namespace = {name: cls for cls, name in names.items()}
+    exec(compile(source, "<content schema>", "exec"), namespace)
+    return namespace["check"]
+
+# tech_terms.json and the --terms overlays: terms grouped by category,
+# aliases to those terms, and (overlays) terms to drop from earlier files
+TERM_DICTIONARY_SCHEMA = {
+    "type": dict,
+    "keys": {
+        "terms": {"type": dict, "values": {"type": list, "items": {"type": str}}},
+        "aliases": {"type": dict, "values": {"type": str}},
+        "remove": {"type": list, "items": {"type": str}},
+    },
+}
+
+CONTENT_VALIDATOR = compile_schema(CONTENT_SCHEMA)
+JOB_VALIDATOR = compile_schema(JOB_SCHEMA)
+TERM_DICTIONARY_VALIDATOR = compile_schema(TERM_DICTIONARY_SCHEMA)
+
+def validate_content(data, max_errors=None):
+    """
+    Validate data against CONTENT_SCHEMA in a single traversal.
+    Stops after max_errors errors (1 = fail fast) and returns a ValidationResult.
+    """
+    result = ValidationResult(max_errors)
+    try:
+        CONTENT_VALIDATOR(data, result)
+    except _ErrorLimitReached:
+        pass
+    return result
+
+def validate_json_structure(data, max_errors=None):
     """
     Validates that the loaded JSON matches the expected structure and types.
     Returns (True, None) if valid, or (False, error_message) if invalid.
     """
-    errors = []
+    result = validate_content(data, max_errors)
+    if result.valid:
+        return True, None
+    return False, format_validation_errors(result)
 
-    if not isinstance(data, dict):
-        return False, "Root element must be a dictionary (object)."
+def format_validation_errors(result):
+    """One error per line, noting when the error limit cut validation short."""
+    errors = list(result.errors)
+    if result.truncated:
+        errors.append(f"(stopped after {len(result.errors)} error(s))")
+    return "\n".join(errors)
 
-    # 1. Validate top-level required keys
-    required_keys = ["name", "contact_info", "summary", "skills", "experience", "education", "languages"]
-    for key in required_keys:
-        if key not in data:
-            errors.append(f"Missing required top-level key: '{key}'")
 
-    if errors:
-        return False, "\n".join(errors)
+# =============================================================================
+# CONTENT MODEL
+# =============================================================================
 
-    # 2. Validate Contact Info
-    c_info = data.get("contact_info")
-    if not isinstance(c_info, dict):
-        errors.append("'contact_info' must be a dictionary.")
-    else:
-        if not isinstance(c_info.get("phone"), str):
-            errors.append("'contact_info.phone' must be a string.")
-        if not isinstance(c_info.get("email"), str):
-            errors.append("'contact_info.email' must be a string.")
-
-        # Optional URL fields
-        if "linkedin_url" in c_info and not isinstance(c_info["linkedin_url"], str):
-             errors.append("'contact_info.linkedin_url' must be a string.")
-        if "github_url" in c_info and not isinstance(c_info["github_url"], str):
-             errors.append("'contact_info.github_url' must be a string.")
-
-    # 3. Validate Summary
-    summary = data.get("summary")
-    if not isinstance(summary, list):
-        errors.append("'summary' must be a list.")
-    else:
-        for idx, item in enumerate(summary):
-            if not isinstance(item, dict):
-                errors.append(f"Summary item #{idx} must be a dictionary.")
+# Mask of an entry without target_audiences: every bit set, so testing it
+# against any audience's bit succeeds
+ALL_AUDIENCES = -1
+
+class ContentItem:
+    """
+    A summary, skills or bullet entry. mask has one bit per audience the
+    entry targets (bits from Content.audiences), or is ALL_AUDIENCES.
+    """
+
+    __slots__ = ("text", "mask", "priority")
+
+    def __init__(self, text, mask=ALL_AUDIENCES, priority=0):
+        self.text = text
+        self.mask = mask
+        self.priority = priority    # --max-pages drops the lowest first
+
+class ContentJob:
+    """One experience entry; intro is "" when the job has none."""
+
+    __slots__ = ("title", "company", "dates", "intro", "bullets")
+
+    def __init__(self, title, company, dates, intro, bullets):
+        self.title = title
+        self.company = company
+        self.dates = dates
+        self.intro = intro
+        self.bullets = bullets      # tuple of ContentItems
+
+class Content:
+    """
+    A validated content document in compact form, built once by
+    build_content and read by filtering, highlighting and rendering.
+    Audience names are interned into bits (audiences maps name -> bit), so
+    each entry carries one int instead of a list of strings. experience is
+    a tuple of ContentJobs, or StreamedJobs for files too large to hold.
+    """
+
+    __slots__ = ("name", "contact_info", "summary", "skills", "experience",
+                 "education", "languages", "audiences", "index")
+
+    def __init__(self, name, contact_info, summary, skills, experience, education, languages, audiences, index):
+        self.name = name
+        self.contact_info = contact_info
+        self.summary = summary      # tuple of ContentItems
+        self.skills = skills        # tuple of ContentItems
+        self.experience = experience
+        self.education = education
+        self.languages = languages
+        self.audiences = audiences
+        self.index = index          # AudienceIndex over the same bits
+
+def audience_mask(names, audiences):
+    """
+    Bitmask of the audience names, interning new ones into audiences
+    (name -> bit); ALL_AUDIENCES when names is empty.
+    """
+    mask = 0
+    for name in names:
+        bit = audiences.get(name)
+        if bit is None:
+            bit = audiences[name] = 1 << len(audiences)
+        mask |= bit
+    return mask or ALL_AUDIENCES
+
+def content_items(entries, audiences):
+    return tuple(
+        ContentItem(entry["text"], audience_mask(entry.get("target_audiences", ()), audiences), entry.get("priority", 0))
+        for entry in entries
+    )
+
+def content_job(job, audiences):
+    """The ContentJob of one validated experience entry."""
+    return ContentJob(
+        job["title"], job["company"], job["dates"], job.get("intro", ""),
+        content_items(job["bullets"], audiences),
+    )
+
+def build_content(data, experience=None, index=None):
+    """
+    The Content of a validated content dictionary. A streamed load passes
+    its StreamedJobs and the AudienceIndex it built while reading them.
+    """
+    audiences = index.bits if index is not None else {}
+    summary = content_items(data["summary"], audiences)
+    skills = content_items(data["skills"], audiences)
+    if experience is None:
+        experience = tuple(content_job(job, audiences) for job in data["experience"])
+    if index is None:
+        index = AudienceIndex(audiences)
+        for job_idx, job in enumerate(experience):
+            index.add_section(job_idx, job.bullets)
+    index.add_section("summary", summary)
+    index.add_section("skills", skills)
+    return Content(
+        data["name"], data["contact_info"], summary, skills, experience,
+        data["education"], data["languages"], audiences, index,
+    )
+
+def as_content(data):
+    """
+    data as a Content: a Content is returned as is and a parsed content
+    dictionary goes through build_content. The public helpers that take
+    content accept either; pass a Content when rendering several audiences.
+    """
+    return data if isinstance(data, Content) else build_content(data)
+
+# Masks, union of the targeted masks and positions of ALL_AUDIENCES entries
+_EMPTY_SECTION = ((), 0, ())
+
+class AudienceIndex:
+    """
+    The audience masks of a document's entries by section: "summary",
+    "skills" and the job index for experience bullets. Each section also
+    keeps the union of its targeted masks, so an audience none of them
+    names gets the universal entries without a scan. Built with the
+    Content it belongs to; streamed loads add each job's bullets as they
+    arrive.
+    """
+
+    def __init__(self, audiences):
+        self.bits = audiences
+        self.sections = {}
+
+    @property
+    def audiences(self):
+        """Every audience named in the document."""
+        return self.bits.keys()
+
+    def add_section(self, key, items):
+        masks = tuple(item.mask for item in items)
+        union = 0
+        universal = []
+        for pos, mask in enumerate(masks):
+            if mask == ALL_AUDIENCES:
+                universal.append(pos)
+            else:
+                union |= mask
+        self.sections[key] = (masks, union, tuple(universal))
+
+    def positions(self, key, target_audience):
+        """Positions visible to target_audience in a section, in original order."""
+        masks, union, universal = self.sections.get(key, _EMPTY_SECTION)
+        bit = self.bits.get(target_audience, 0)
+        if union & bit:
+            return [pos for pos, mask in enumerate(masks) if mask & bit]
+        return list(universal)
+
+    def select(self, items, key, target_audience):
+        """The entries of an indexed section that target_audience sees."""
+        return [items[pos] for pos in self.positions(key, target_audience)]
+
+    def selection(self, target_audience):
+        """
+        Everything target_audience sees, as positions: the summary and skills
+        entry build_resume_document picks (the first visible one) and the
+        bullets of every job. Audiences with equal selections get the same
+        document, so only one of them needs rendering.
+        """
+        summary = self.positions("summary", target_audience)[:1]
+        skills = self.positions("skills", target_audience)[:1]
+        bit = self.bits.get(target_audience, 0)
+        jobs = []
+        for key, (masks, union, universal) in self.sections.items():
+            if not isinstance(key, int):
                 continue
-            if "text" not in item:
-                errors.append(f"Summary item #{idx} missing 'text'.")
-            if "target_audiences" in item and not isinstance(item["target_audiences"], list):
-                errors.append(f"Summary item #{idx} 'target_audiences' must be a list of strings.")
-
-    # 4. Validate Skills
-    skills = data.get("skills")
-    if not isinstance(skills, list):
-        errors.append("'skills' must be a list.")
-    else:
-        for idx, item in enumerate(skills):
-            if not isinstance(item, dict):
-                errors.append(f"Skills item #{idx} must be a dictionary.")
+            if union & bit:
+                jobs.append((key, tuple([pos for pos, mask in enumerate(masks) if mask & bit])))
+            elif universal:
+                jobs.append((key, universal))
+        return (tuple(summary), tuple(skills), tuple(jobs))
+
+def collect_all_audiences(data, index=None):
+    """
+    Finds all unique strings used in 'target_audiences'.
+    Returns a set of audience strings (e.g., {'web2', 'web3', 'ios'}).
+    Pass an existing AudienceIndex to avoid walking the data again.
+    """
+    if index is None:
+        index = as_content(data).index
+    return set(index.audiences)
+
+# =============================================================================
+# STREAMING CONTENT
+# =============================================================================
+
+_JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+class _JsonStream:
+    """
+    Incremental JSON reader over a text file.
+    Holds only the unparsed tail of the file plus the value being decoded,
+    and reports errors with line/column positions in the whole file.
+    """
+
+    def __init__(self, f, chunk_size=STREAM_CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        # Offset, line count and current line start of the text already dropped
+        self.consumed = 0
+        self.lines = 0
+        self.line_start = 0
+
+    def _fill(self):
+        if self.pos:
+            dropped = self.buf.count("\n", 0, self.pos)
+            if dropped:
+                self.lines += dropped
+                self.line_start = self.consumed + self.buf.rfind("\n", 0, self.pos) + 1
+            self.consumed += self.pos
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        chunk = self.f.read(self.chunk_size)
+        if chunk:
+            self.buf += chunk
+        else:
+            self.eof = True
+
+    def _error(self, msg, pos):
+        """A JSONDecodeError positioned in the whole file, not the buffer."""
+        err = json.JSONDecodeError(msg, self.buf, pos)
+        err.pos = self.consumed + pos
+        err.lineno = self.lines + self.buf.count("\n", 0, pos) + 1
+        last_newline = self.buf.rfind("\n", 0, pos)
+        err.colno = pos - last_newline if last_newline >= 0 else err.pos - self.line_start + 1
+        err.args = (f"{msg}: line {err.lineno} column {err.colno} (char {err.pos})",)
+        return err
+
+    def peek(self):
+        """Next non-whitespace character, or '' at the end of the file."""
+        while True:
+            self.pos = _JSON_WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if self.eof:
+                return ""
+            self._fill()
+
+    def expect(self, chars):
+        """Consume the next character, which must be one of chars, and return it."""
+        char = self.peek()
+        if not char or char not in chars:
+            expected = " or ".join(repr(c) for c in chars)
+            raise self._error(f"Expecting {expected} delimiter", self.pos)
+        self.pos += 1
+        return char
+
+    def decode(self):
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError as e:
+                if self.eof:
+                    raise self._error(e.msg, e.pos) from None
+                self._fill()
                 continue
-            if "text" not in item:
-                errors.append(f"Skills item #{idx} missing 'text'.")
-            if "target_audiences" in item and not isinstance(item["target_audiences"], list):
-                errors.append(f"Skills item #{idx} 'target_audiences' must be a list of strings.")
-
-    # 5. Validate Experience
-    experience = data.get("experience")
-    if not isinstance(experience, list):
-        errors.append("'experience' must be a list.")
-    else:
-        for idx, job in enumerate(experience):
-            if not isinstance(job, dict):
-                errors.append(f"Experience item #{idx} must be a dictionary.")
+            # A number ending exactly at the buffer edge may continue in the next chunk
+            if end == len(self.buf) and not self.eof:
+                self._fill()
                 continue
-            required_job_keys = ["title", "company", "dates", "bullets"]
-            for k in required_job_keys:
-                if k not in job:
-                    errors.append(f"Experience item #{idx} missing key '{k}'.")
-
-            # Validate bullets
-            bullets = job.get("bullets", [])
-            if not isinstance(bullets, list):
-                errors.append(f"Experience item #{idx} 'bullets' must be a list.")
+            self.pos = end
+            return value
+
+    def expect_end(self):
+        if self.peek():
+            raise self._error("Extra data", self.pos)
+
+def iter_json_object(f, stream_key):
+    """
+    Parse a top-level JSON object from f, yielding (key, index, value).
+    Most members are yielded whole with index None. If the value of stream_key
+    is an array, its items are yielded one at a time as (stream_key, i, item),
+    followed by (stream_key, None, []) for the array itself.
+    A top-level value that is not an object is yielded as (None, None, value).
+    """
+    stream = _JsonStream(f)
+    if stream.peek() != "{":
+        value = stream.decode()
+        stream.expect_end()
+        yield None, None, value
+        return
+
+    stream.expect("{")
+    if stream.peek() == "}":
+        stream.expect("}")
+        stream.expect_end()
+        return
+
+    while True:
+        if stream.peek() != '"':
+            raise stream._error("Expecting property name enclosed in double quotes", stream.pos)
+        key = stream.decode()
+        stream.expect(":")
+        if key == stream_key and stream.peek() == "[":
+            stream.expect("[")
+            if stream.peek() == "]":
+                stream.expect("]")
             else:
-                for b_idx, bullet in enumerate(bullets):
-                    if not isinstance(bullet, dict):
-                        errors.append(f"Experience item #{idx} bullet #{b_idx} must be a dictionary.")
-                        continue
-                    if "text" not in bullet:
-                        errors.append(f"Experience item #{idx} bullet #{b_idx} missing 'text'.")
-                    if "target_audiences" in bullet and not isinstance(bullet["target_audiences"], list):
-                        errors.append(f"Experience item #{idx} bullet #{b_idx} 'target_audiences' must be a list.")
+                item_idx = 0
+                while True:
+                    yield key, item_idx, stream.decode()
+                    item_idx += 1
+                    if stream.expect(",]") == "]":
+                        break
+            yield key, None, []
+        else:
+            yield key, None, stream.decode()
+        if stream.expect(",}") == "}":
+            break
+    stream.expect_end()
+
+def _file_stamp(path):
+    stat = os.stat(path)
+    return (stat.st_size, stat.st_mtime_ns)
+
+class StreamedJobs:
+    """
+    The experience of a content file too large to hold in memory. Each
+    iteration parses the file again one job at a time, so rendering holds a
+    single ContentJob plus the story rather than the whole history.
+    """
 
-            # Validate optional intro
-            if "intro" in job and not isinstance(job["intro"], str):
-                errors.append(f"Experience item #{idx} 'intro' must be a string.")
+    def __init__(self, path, job_count, audiences):
+        self.path = path
+        self.job_count = job_count
+        self.audiences = audiences
+        self.stamp = _file_stamp(path)
 
-    if errors:
-        return False, "\n".join(errors)
+    def __iter__(self):
+        if _file_stamp(self.path) != self.stamp:
+            raise ValueError(f"{self.path} changed on disk since it was loaded")
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for key, job_idx, job in iter_json_object(f, "experience"):
+                if key == "experience" and job_idx is not None:
+                    yield content_job(job, self.audiences)
 
-    return True, None
+    def __len__(self):
+        return self.job_count
 
-def collect_all_audiences(data):
+def stream_content_file(path, max_errors=None):
     """
-    Scans the JSON data to find all unique strings used in 'target_audiences'.
-    Returns a set of audience strings (e.g., {'web2', 'web3', 'ios'}).
+    Parse and validate a content file one experience entry at a time.
+    Each job is checked against JOB_SCHEMA and indexed as soon as it is
+    decoded, then dropped. Returns (Content or None, ValidationResult).
+    Raises OSError or json.JSONDecodeError like json.load.
+    """
+    result = ValidationResult(max_errors)
+    index = AudienceIndex({})
+    fields = {}
+    job_count = 0
+    experience_path = (None, "experience")
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for key, job_idx, value in iter_json_object(f, "experience"):
+                if key is None:
+                    CONTENT_VALIDATOR(value, result)
+                    return None, result
+                if job_idx is None:
+                    fields[key] = value
+                    continue
+                JOB_VALIDATOR(value, result, (experience_path, job_idx))
+                if result.valid:
+                    index.add_section(job_idx, content_job(value, index.bits).bullets)
+                job_count = job_idx + 1
+        # The streamed experience array appears in fields as an empty list
+        CONTENT_VALIDATOR(fields, result)
+    except _ErrorLimitReached:
+        pass
+
+    if not result.valid:
+        return None, result
+    return build_content(fields, StreamedJobs(path, job_count, index.bits), index), result
+
+def parse_content_file(path, max_errors=None):
+    """
+    Parse and validate a content file. Files of STREAMING_THRESHOLD_BYTES or
+    more are streamed; smaller ones are loaded eagerly with json.load.
+    Returns (Content, None) if valid or (None, error message) if not, and
+    raises OSError or json.JSONDecodeError.
+    """
+    if os.path.getsize(path) >= STREAMING_THRESHOLD_BYTES:
+        data, result = stream_content_file(path, max_errors)
+        return (data, None) if result.valid else (None, format_validation_errors(result))
+
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    is_valid, error_msg = validate_json_structure(data, max_errors)
+    return (build_content(data), None) if is_valid else (None, error_msg)
+
+# =============================================================================
+# DOCUMENT MODEL
+# =============================================================================
+
+class ResumeJob:
+    """One job of a ResumeDocument, with the bullets its audience sees."""
+
+    def __init__(self, index, title, company, dates, intro, bullets):
+        self.index = index          # position in content.experience
+        self.title = title
+        self.company = company
+        self.dates = dates
+        self.intro = intro          # highlighted markup, or None
+        self.bullets = bullets      # [(position, highlighted markup, priority)]
+
+class ResumeDocument:
+    """
+    One audience's resume, independent of the output format: the sections
+    that audience sees, with tech terms already highlighted. Built once per
+    audience by build_resume_document and handed to every renderer.
+    Text fields hold paragraph markup (<b>, <i>, <a href>, entities);
+    markup_runs splits it into styled runs for formats other than PDF.
+    """
+
+    titles = SECTION_TITLES
+
+    def __init__(self, content, audience, summary, skills, jobs):
+        self.content = content
+        self.audience = audience
+        self.name = content.name
+        self.contact_info = content.contact_info
+        self.summary = summary      # (position, highlighted markup), or None
+        self.skills = skills        # (position, markup), or None
+        self.jobs = jobs            # ResumeJobs with at least one bullet
+        self.education = content.education
+        self.languages = content.languages
+        self.streamed = isinstance(content.experience, StreamedJobs)
+
+def build_resume_document(content, target_audience, index=None):
     """
-    audiences = set()
+    The ResumeDocument of one audience: summary, skills and bullets picked
+    through the AudienceIndex and highlighted with format_text_with_bold_tech.
+    Experience is read once, so streamed content costs a single pass.
+    """
+    content = as_content(content)
+    if index is None:
+        index = content.index
+
+    summary = None
+    summary_positions = index.positions("summary", target_audience)
+    if summary_positions:
+        pos = summary_positions[0]
+        summary = (pos, format_text_with_bold_tech(content.summary[pos].text))
+
+    skills = None
+    skills_positions = index.positions("skills", target_audience)
+    if skills_positions:
+        pos = skills_positions[0]
+        skills = (pos, content.skills[pos].text)
+
+    jobs = []
+    for job_idx, job in enumerate(content.experience):
+        positions = index.positions(job_idx, target_audience)
+        if not positions:
+            continue
+        intro = format_text_with_bold_tech(job.intro) if job.intro.strip() else None
+        bullets = job.bullets
+        jobs.append(ResumeJob(
+            job_idx, job.title, job.company, job.dates, intro,
+            [(pos, format_text_with_bold_tech(bullets[pos].text), bullets[pos].priority) for pos in positions],
+        ))
+
+    return ResumeDocument(content, target_audience, summary, skills, jobs)
+
+def document_id(content, target_audience, theme):
+    """Stable identity of an audience PDF in reproducible mode, else None."""
+    if not theme.reproducible:
+        return None
+    return f"{content.name}|{target_audience}"
+
+class HitCounter:
+    """Hit/miss counts of an in-memory cache, summed over worker processes."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
 
-    def scan_list(items):
-        for item in items:
-            if isinstance(item, dict):
-                if "target_audiences" in item and isinstance(item["target_audiences"], list):
-                    for aud in item["target_audiences"]:
-                        audiences.add(aud)
+    def drain(self):
+        """Counts since the last drain, for a worker to send back."""
+        counts = (self.hits, self.misses)
+        self.hits = self.misses = 0
+        return counts
 
-    # Scan Summary
-    scan_list(data.get("summary", []))
-    # Scan Skills
-    scan_list(data.get("skills", []))
-    # Scan Experience Bullets
-    for job in data.get("experience", []):
-        scan_list(job.get("bullets", []))
+    def merge(self, counts):
+        self.hits += counts[0]
+        self.misses += counts[1]
 
-    return audiences
+    def stats(self):
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / total if total else 0.0}
+
+# Lookups of cached PDF job blocks (pdf_renderer.StoryParts) over the whole run
+JOB_BLOCK_STATS = HitCounter()
+
+# Render jobs over the whole run: hits were served by another audience's
+# render with the same selection (AudienceIndex.selection), misses rendered
+VARIANT_STATS = HitCounter()
 
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
 
-def load_content():
+def load_content(max_errors=None):
     """
     Load content from content.json.
     If missing, create it. If present, validate it.
@@ -451,21 +1512,20 @@ def load_content():
         with open(JSON_FILENAME, 'w', encoding='utf-8') as f:
             json.dump(DEFAULT_CONTENT, f, indent=4)
         print(f"✓ Created {JSON_FILENAME}. Using template data.")
-        return DEFAULT_CONTENT
+        return build_content(DEFAULT_CONTENT)
     else:
         print(f"✓ Found {JSON_FILENAME}. Loading data...")
         try:
-            with open(JSON_FILENAME, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            # Validate
-            is_valid, error_msg = validate_json_structure(data)
-            if not is_valid:
+            # Load and validate, streaming large files
+            data, error_msg = parse_content_file(JSON_FILENAME, max_errors)
+            if error_msg is not None:
                 print("\n❌ DATA VALIDATION FAILED:")
                 print(error_msg)
                 print("\nPlease fix 'content.json' and try again.")
                 exit(1)
 
+            if isinstance(data.experience, StreamedJobs):
+                print(f"✓ Streamed {len(data.experience)} jobs from a large file.")
             print("✓ Data validation passed.")
             return data
 
@@ -473,255 +1533,2200 @@ def load_content():
             print(f"❌ Error decoding JSON: {e}")
             exit(1)
 
-def format_text_with_bold_tech(text):
+def read_content_file(path, max_errors=None):
     """
-    Bold technical terms using Regex to handle punctuation.
+    Load and validate a content file without exiting.
+    Returns (data, None) on success or (None, error message) on failure.
     """
-    terms = sorted(TECH_TERMS, key=len, reverse=True)
+    try:
+        return parse_content_file(path, max_errors)
+    except json.JSONDecodeError as e:
+        return None, f"Error decoding JSON: {e}"
+    except OSError as e:
+        return None, f"Error reading file: {e}"
+
+def list_audiences(data, index=None):
+    """Sorted audiences for a document, or ['General'] when none are declared."""
+    return sorted(collect_all_audiences(data, index)) or ["General"]
+
+def output_filename(data, target_audience, today_str, fmt="pdf"):
+    """Date-stamped output filename, e.g. John_Doe_CV_Backend_2024_Jan_01.pdf."""
+    # Snake case the name for filename (e.g., "John Doe" -> "John_Doe")
+    snake_name = as_content(data).name.replace(" ", "_")
+    clean_audience = target_audience.capitalize().replace(" ", "_")
+    return f"{snake_name}_CV_{clean_audience}_{today_str}{RENDERERS[fmt]['extension']}"
 
-    for term in terms:
-        escaped_term = re.escape(term)
-        # Matches term if NOT already surrounded by bold tags, and NOT part of another word.
-        pattern = r"(<b>" + escaped_term + r"</b>)|((?<![a-zA-Z0-9])" + escaped_term + r"(?![a-zA-Z0-9]))"
+def format_text_with_bold_tech(text):
+    """
+    Bold technical terms in a single pass over the text.
+    Matching is case-insensitive, respects word boundaries, prefers the longest
+    term and leaves existing <b> runs and markup tags untouched.
+    Results are memoized in FORMAT_CACHE.
+    """
+    profiler = PROFILER
+    if profiler is not None:
+        profiler.count("highlight_calls")
+
+    cached = FORMAT_CACHE.get(text)
+    if cached is not None:
+        return cached
+
+    matches = 0
+    parts = []
+    pos = 0
+    for start, end, bold, _ in tech_term_matcher().scan(text):
+        if not bold:
+            parts += (text[pos:start], "<b>", text[start:end], "</b>")
+            pos = end
+            matches += 1
+    parts.append(text[pos:])
+
+    formatted = "".join(parts)
+    FORMAT_CACHE.put(text, formatted)
+    if profiler is not None:
+        profiler.count("highlight_uncached", 1)
+        profiler.count("highlight_matches", matches)
+    return formatted
+
+def find_tech_terms(text):
+    """
+    The dictionary terms text mentions, as canonical spellings in order of
+    first appearance. Runs the highlighter's matcher, so it finds what
+    format_text_with_bold_tech bolds, plus terms inside existing <b> runs.
+    """
+    found = {}
 
-        def replace_func(match):
-            if match.group(1): return match.group(1)
-            return f"<b>{match.group(2)}</b>"
+    def scan(text):
+        for start, end, bold, term in tech_term_matcher().scan(text):
+            if bold:
+                scan(text[start + 3:end - 4])
+            else:
+                found.setdefault(term)
 
-        text = re.sub(pattern, replace_func, text, flags=re.IGNORECASE)
+    scan(text)
+    return list(found)
 
-    return text
+def build_story(content, target_audience, theme=None, index=None, drop=frozenset()):
+    """
+    Build the list of flowables for one audience, without laying it out.
+    See pdf_renderer.build_story; drop holds (job_idx, bullet position)
+    pairs to leave out.
+    """
+    import pdf_renderer
+    theme = theme or get_theme()
+    document = build_resume_document(content, target_audience, index)
+    return pdf_renderer.build_story(document, theme.pdf, drop, JOB_BLOCK_STATS)
 
-def filter_content(items, target_audience):
+def create_pdf(filename, content, target_audience, theme=None, index=None):
     """
-    Filter list items based on target_audience.
-    Item is kept if:
-    1. It has NO 'target_audiences' key (implies universal).
-    2. 'target_audiences' is empty (implies universal).
-    3. 'target_audience' is present in the item's 'target_audiences' list.
+    Generate PDF resume for a specific target audience.
+    filename may be a path or a writable binary file-like object (e.g. BytesIO).
+    Pass the document's AudienceIndex when rendering several audiences.
     """
-    filtered = []
-    for item in items:
-        audiences = item.get("target_audiences", [])
+    with profile_stage("model", target_audience):
+        document = build_resume_document(content, target_audience, index)
+    write_pdf(filename, document, theme or get_theme())
+
+def write_pdf(filename, document, theme):
+    """Lay out a ResumeDocument as a PDF at filename (a path or binary file object)."""
+    import pdf_renderer
+    target_audience = document.audience
+    if theme.max_pages:
+        pages, dropped, flowables = build_to_fit(filename, document, theme)
+        if PROFILER is not None:
+            PROFILER.note(target_audience, "flowables", flowables)
+            PROFILER.note(target_audience, "pages", pages)
+            PROFILER.note(target_audience, "bullets_dropped", dropped)
+        return
+
+    with profile_stage("build_story", target_audience):
+        story = pdf_renderer.build_story(document, theme.pdf, block_stats=JOB_BLOCK_STATS)
+
+    doc = pdf_renderer.new_document(filename, theme.pdf)
+    flowables = len(story)
+    with profile_stage("doc_build", target_audience):
+        pdf_renderer.build_document(doc, story, document_id(document.content, target_audience, theme))
+
+    if PROFILER is not None:
+        PROFILER.note(target_audience, "flowables", flowables)
+        PROFILER.note(target_audience, "pages", doc.page)
 
-        # Universal content (no specific target defined)
-        if not audiences:
-            filtered.append(item)
-            continue
+# =============================================================================
+# LAYOUT FIT
+# =============================================================================
 
-        # Targeted content
-        if target_audience in audiences:
-            filtered.append(item)
+def drop_order(document):
+    """
+    The document's bullets as (job_idx, position), in the order --max-pages
+    removes them: lowest priority first, then oldest job, then last bullet.
+    """
+    candidates = []
+    for job in document.jobs:
+        for pos, _, priority in job.bullets:
+            candidates.append((priority, -job.index, -pos))
+    candidates.sort()
+    return [(-neg_job, -neg_pos) for _, neg_job, neg_pos in candidates]
+
+def fit_story(document, theme, doc, slack=0):
+    """
+    The fullest story estimated to fit theme.max_pages: the normal story if
+    it fits, else the tightened one, else the tightened one minus the fewest
+    bullets in drop_order (found by binary search over wrap() measurements).
+    Returns (story, dropped bullet count). If nothing fits, returns the
+    tightened story with every bullet kept.
+    """
+    import pdf_renderer
+    budget = theme.max_pages
+    styles = theme.pdf
+    story = pdf_renderer.build_story(document, styles, block_stats=JOB_BLOCK_STATS)
+    if pdf_renderer.estimate_pages(story, doc, slack) <= budget:
+        return story, 0
+
+    order = drop_order(document)
+
+    def measure(count):
+        trial = pdf_renderer.tighten(pdf_renderer.build_story(document, styles, frozenset(order[:count]), JOB_BLOCK_STATS))
+        return trial, pdf_renderer.estimate_pages(trial, doc, slack) <= budget
+
+    tight, fits = measure(0)
+    if fits:
+        return tight, 0
+    best, fits = measure(len(order))
+    if not fits:
+        return tight, 0
+
+    low, high = 1, len(order)
+    while low < high:
+        mid = (low + high) // 2
+        trial, fits = measure(mid)
+        if fits:
+            best, high = trial, mid
+        else:
+            low = mid + 1
+    return best, high
+
+def build_to_fit(filename, document, theme):
+    """
+    Render a PDF that fits theme.max_pages using at most MAX_FIT_BUILDS full
+    builds. Each build that still overflows shortens the estimated page by
+    a further 3% before bullets are chosen again.
+    Returns (pages, dropped bullet count, flowable count).
+    """
+    import pdf_renderer
+    target_audience = document.audience
+    slack = 0
+    for attempt in range(MAX_FIT_BUILDS):
+        buffer = io.BytesIO()
+        doc = pdf_renderer.new_document(buffer, theme.pdf)
+        with profile_stage("fit", target_audience):
+            story, dropped = fit_story(document, theme, doc, slack)
+        flowables = len(story)
+        with profile_stage("doc_build", target_audience):
+            pdf_renderer.build_document(doc, story, document_id(document.content, target_audience, theme))
+        if doc.page <= theme.max_pages:
+            break
+        slack += 0.03 * doc.height
+
+    if doc.page > theme.max_pages:
+        print(f"⚠ {target_audience}: {doc.page} pages after {attempt + 1} builds (budget {theme.max_pages})")
+    elif dropped:
+        print(f"✂ {target_audience}: dropped {dropped} bullet(s) to fit {theme.max_pages} page(s)")
+
+    if hasattr(filename, "write"):
+        filename.write(buffer.getvalue())
+    else:
+        write_pdf_file(filename, buffer.getvalue())
+    return doc.page, dropped, flowables
 
-    return filtered
+# =============================================================================
+# TEXT FORMATS
+# =============================================================================
 
-def create_pdf(filename, content, target_audience):
-    """Generate PDF resume for a specific target audience."""
+class _RunParser(HTMLParser):
+    """Collects the (text, bold, italic, href) runs of paragraph markup."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.runs = []
+        self.bold = 0
+        self.italic = 0
+        self.href = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ("b", "strong"):
+            self.bold += 1
+        elif tag in ("i", "em"):
+            self.italic += 1
+        elif tag == "a":
+            self.href = dict(attrs).get("href")
+        elif tag == "br":
+            self.runs.append(("\n", False, False, None))
+
+    def handle_endtag(self, tag):
+        if tag in ("b", "strong"):
+            self.bold = max(self.bold - 1, 0)
+        elif tag in ("i", "em"):
+            self.italic = max(self.italic - 1, 0)
+        elif tag == "a":
+            self.href = None
+
+    def handle_data(self, data):
+        self.runs.append((data, self.bold > 0, self.italic > 0, self.href))
+
+@lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def markup_runs(markup):
+    """
+    Paragraph markup as a tuple of (text, bold, italic, href) runs, with
+    entities decoded. <br/> becomes a newline run; other tags such as
+    <font> are dropped. Cached, since audiences share most of their text.
+    """
+    parser = _RunParser()
+    parser.feed(markup)
+    parser.close()
+    return tuple(parser.runs)
 
-    # Extract Contact Info logic
-    c_info = content.get("contact_info", {})
+def plain_text(markup):
+    """Markup reduced to its text, with non-breaking spaces as plain spaces."""
+    return "".join(run[0] for run in markup_runs(markup)).replace("\xa0", " ")
 
+def contact_items(document):
+    """
+    (text, value, href) of each contact field present, in header order:
+    text is what rich formats show, value the raw phone, address or URL.
+    """
+    c_info = document.contact_info
+    items = []
     phone = c_info.get("phone", "")
-    email = c_info.get("email", "")
-
-    # Build contact parts list
-    contact_parts = []
     if phone:
-        contact_parts.append(phone)
+        items.append((phone, phone, None))
+    email = c_info.get("email", "")
     if email:
-        contact_parts.append(email)
-
-    # Optional URLs
-    linkedin = c_info.get("linkedin_url", "").strip()
-    if linkedin:
-        contact_parts.append(f"<a href='{linkedin}' color='#005b96'>LinkedIn</a>")
-
-    github = c_info.get("github_url", "").strip()
-    if github:
-        contact_parts.append(f"<a href='{github}' color='#005b96'>GitHub</a>")
-
-    current_contact_info = " | ".join(contact_parts)
-    name = content.get("name", "Unknown Name")
-
-    doc = SimpleDocTemplate(
-        filename,
-        pagesize=LETTER,
-        rightMargin=0.5*inch,
-        leftMargin=0.5*inch,
-        topMargin=0.4*inch,
-        bottomMargin=0.4*inch
-    )
-
-    styles = getSampleStyleSheet()
-
-    style_name = ParagraphStyle(
-        'NameTitle',
-        parent=styles['Normal'],
-        fontName='Helvetica-Bold',
-        fontSize=24,
-        textColor=colors.HexColor("#2C3E50"),
-        leading=28,
-        spaceAfter=4
-    )
-
-    style_contact = ParagraphStyle(
-        'Contact',
-        parent=styles['Normal'],
-        fontName='Helvetica',
-        fontSize=10,
-        textColor=colors.HexColor("#7F8C8D"),
-        alignment=TA_RIGHT,
-        leading=12
-    )
-
-    style_section = ParagraphStyle(
-        'SectionHeader',
-        parent=styles['Normal'],
-        fontName='Helvetica-Bold',
-        fontSize=11,
-        textColor=colors.HexColor("#2C3E50"),
-        spaceBefore=6,
-        spaceAfter=2
-    )
-
-    style_body = ParagraphStyle(
-        'BodyText',
-        parent=styles['Normal'],
-        fontName='Helvetica',
-        fontSize=10,
-        leading=14,
-        alignment=TA_LEFT,
-        leftIndent=0,
-        firstLineIndent=0,
-        spaceAfter=4
-    )
-
-    style_bullet = ParagraphStyle(
-        'Bullet',
-        parent=styles['Normal'],
-        fontName='Helvetica',
-        fontSize=10,
-        leading=13,
-        leftIndent=16,
-        firstLineIndent=-10,
-        spaceAfter=2
-    )
-
-    story = []
-
-    # Header
-    header_data = [[Paragraph(name, style_name), Paragraph(current_contact_info, style_contact)]]
-    t_header = Table(header_data, colWidths=[3.5*inch, 4.0*inch])
-    t_header.setStyle(TableStyle([
-        ('VALIGN', (0,0), (-1,-1), 'BOTTOM'),
-        ('LEFTPADDING', (0,0), (-1,-1), 0),
-        ('RIGHTPADDING', (0,0), (-1,-1), 0),
-    ]))
-    story.append(t_header)
-
-    story.append(Spacer(1, 2))
-
-    # Summary
-    summary_items = filter_content(content.get("summary", []), target_audience)
-    if summary_items:
-        formatted_summary = format_text_with_bold_tech(summary_items[0]["text"])
-        story.append(Paragraph(formatted_summary, style_body))
-        story.append(Spacer(1, 1))
-
-    # Skills
-    story.append(Paragraph("TECHNICAL SKILLS", style_section))
-    t_line = Table([[""]], colWidths=[7.5*inch], rowHeights=1)
-    t_line.setStyle(TableStyle([('LINEABOVE', (0,0), (-1,-1), 1, colors.HexColor("#BDC3C7"))]))
-    story.append(t_line)
-    story.append(Spacer(1, 2))
-
-    skills_items = filter_content(content.get("skills", []), target_audience)
-    if skills_items:
-        story.append(Paragraph(skills_items[0]["text"], style_body))
-
-    story.append(Spacer(1, 1))
-
-    # Experience
-    story.append(Paragraph("PROFESSIONAL EXPERIENCE", style_section))
-    story.append(t_line)
-    story.append(Spacer(1, 2))
-
-    for job in content.get("experience", []):
-        filtered_bullets = filter_content(job.get("bullets", []), target_audience)
-        if not filtered_bullets:
+        items.append((email, email, f"mailto:{email}"))
+    for label, key in (("LinkedIn", "linkedin_url"), ("GitHub", "github_url")):
+        url = c_info.get(key, "").strip()
+        if url:
+            items.append((label, url, url))
+    return items
+
+def render_text(document, theme):
+    """Plain UTF-8 text without any markup, for applicant tracking systems."""
+    titles = document.titles
+    lines = [plain_text(document.name)]
+    contact = [plain_text(value) for _, value, _ in contact_items(document)]
+    if contact:
+        lines.append(" | ".join(contact))
+    if document.summary is not None:
+        lines += ["", plain_text(document.summary[1])]
+
+    lines += ["", titles["skills"]]
+    if document.skills is not None:
+        lines.append(plain_text(document.skills[1]))
+
+    lines += ["", titles["experience"]]
+    for job in document.jobs:
+        lines.append(f"{plain_text(job.title)} | {plain_text(job.company)} | {plain_text(job.dates)}")
+        if job.intro is not None:
+            lines.append(plain_text(job.intro))
+        lines.extend(f"- {plain_text(markup)}" for _, markup, _ in job.bullets)
+        lines.append("")
+
+    if document.jobs:
+        lines.pop()
+    lines += ["", titles["education"], plain_text(document.education)]
+    lines += ["", titles["languages"], plain_text(document.languages)]
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+# Characters Markdown would otherwise read as formatting
+_MARKDOWN_SPECIAL = re.compile(r"[\\`*_\[\]<]")
+
+def markdown_inline(markup):
+    """Markup as inline Markdown: **bold**, *italic* and [links](href)."""
+    parts = []
+    for text, bold, italic, href in markup_runs(markup):
+        text = _MARKDOWN_SPECIAL.sub(r"\\\g<0>", text.replace("\xa0", " ")).replace("\n", "  \n")
+        core = text.strip()
+        if core and (bold or italic):
+            mark = "**" * bold + "*" * italic
+            lead = text[:len(text) - len(text.lstrip())]
+            trail = text[len(text.rstrip()):]
+            text = f"{lead}{mark}{core}{mark}{trail}"
+        if core and href:
+            text = f"[{text}]({href})"
+        parts.append(text)
+    return "".join(parts)
+
+def render_markdown(document, theme):
+    """GitHub-flavored Markdown, one heading per section and one list item per bullet."""
+    titles = document.titles
+    lines = [f"# {markdown_inline(document.name)}", ""]
+    contact = [markdown_inline(text) if href is None else f"[{markdown_inline(text)}]({href})"
+               for text, _, href in contact_items(document)]
+    if contact:
+        lines += [" | ".join(contact), ""]
+    if document.summary is not None:
+        lines += [markdown_inline(document.summary[1]), ""]
+
+    lines += [f"## {titles['skills']}", ""]
+    if document.skills is not None:
+        lines += [markdown_inline(document.skills[1]), ""]
+
+    lines += [f"## {titles['experience']}", ""]
+    for job in document.jobs:
+        lines.append(f"### {markdown_inline(job.title)} | {markdown_inline(job.company)}")
+        lines += [f"*{markdown_inline(job.dates)}*", ""]
+        if job.intro is not None:
+            lines += [markdown_inline(job.intro), ""]
+        lines.extend(f"- {markdown_inline(markup)}" for _, markup, _ in job.bullets)
+        lines.append("")
+
+    lines += [f"## {titles['education']}", "", markdown_inline(document.education), ""]
+    lines += [f"## {titles['languages']}", "", markdown_inline(document.languages)]
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+def html_inline(markup):
+    """Markup as escaped HTML with <strong>, <em> and <a> only."""
+    parts = []
+    for text, bold, italic, href in markup_runs(markup):
+        if text == "\n":
+            parts.append("<br>")
             continue
+        text = html.escape(text)
+        if bold:
+            text = f"<strong>{text}</strong>"
+        if italic:
+            text = f"<em>{text}</em>"
+        if href:
+            text = f'<a href="{html.escape(href)}">{text}</a>'
+        parts.append(text)
+    return "".join(parts)
+
+# Page layout of the HTML preview; values come from the theme config
+HTML_STYLE = """
+body {{ font-family: "{font}", Helvetica, Arial, sans-serif; font-size: {body_size}pt; margin: 0; }}
+main {{ max-width: 8.5in; box-sizing: border-box; margin: 0 auto;
+        padding: {margin_top}in {margin_right}in {margin_bottom}in {margin_left}in; }}
+header {{ display: flex; justify-content: space-between; align-items: flex-end; }}
+h1 {{ font-size: {name_size}pt; color: {color_primary}; margin: 0 0 4pt; }}
+.contact {{ font-size: {contact_size}pt; color: {color_muted}; text-align: right; }}
+h2 {{ font-size: {section_size}pt; color: {color_primary}; border-bottom: 1px solid {color_rule};
+      margin: 10pt 0 4pt; padding-bottom: 2pt; }}
+.job {{ display: flex; justify-content: space-between; margin-top: 6pt; }}
+.job-title {{ font-weight: bold; font-size: {job_title_size}pt; }}
+.company, .dates {{ color: {color_secondary}; }}
+p {{ margin: 0 0 4pt; }}
+ul {{ margin: 2pt 0 4pt; padding-left: 16pt; }}
+a {{ color: {color_link}; }}
+"""
+
+def render_html(document, theme):
+    """A standalone HTML page previewing the resume with the theme's fonts, colors and sizes."""
+    titles = document.titles
+    contact = [html_inline(text) if href is None else f'<a href="{html.escape(href)}">{html_inline(text)}</a>'
+               for text, _, href in contact_items(document)]
+
+    lines = [
+        "<!DOCTYPE html>",
+        '<html lang="en">',
+        "<head>",
+        '<meta charset="utf-8">',
+        f"<title>{html.escape(plain_text(document.name))}</title>",
+        f"<style>{HTML_STYLE.format(**theme.config)}</style>",
+        "</head>",
+        "<body>",
+        "<main>",
+        f'<header><h1>{html_inline(document.name)}</h1><div class="contact">{" | ".join(contact)}</div></header>',
+    ]
+    if document.summary is not None:
+        lines.append(f"<p>{html_inline(document.summary[1])}</p>")
+
+    lines.append(f"<section><h2>{html.escape(titles['skills'])}</h2>")
+    if document.skills is not None:
+        lines.append(f"<p>{html_inline(document.skills[1])}</p>")
+    lines.append("</section>")
+
+    lines.append(f"<section><h2>{html.escape(titles['experience'])}</h2>")
+    for job in document.jobs:
+        lines.append(
+            f'<div class="job"><div><span class="job-title">{html_inline(job.title)}</span> | '
+            f'<span class="company">{html_inline(job.company)}</span></div>'
+            f'<div class="dates">{html_inline(job.dates)}</div></div>'
+        )
+        if job.intro is not None:
+            lines.append(f"<p>{html_inline(job.intro)}</p>")
+        lines.append("<ul>")
+        lines.extend(f"<li>{html_inline(markup)}</li>" for _, markup, _ in job.bullets)
+        lines.append("</ul>")
+    lines.append("</section>")
+
+    lines.append(f"<section><h2>{html.escape(titles['education'])}</h2><p>{html_inline(document.education)}</p></section>")
+    lines.append(f"<section><h2>{html.escape(titles['languages'])}</h2><p>{html_inline(document.languages)}</p></section>")
+    lines += ["</main>", "</body>", "</html>"]
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+# =============================================================================
+# RENDERING
+# =============================================================================
+
+def render_pdf(document, theme):
+    """A ResumeDocument as PDF bytes."""
+    buffer = io.BytesIO()
+    write_pdf(buffer, document, theme)
+    return buffer.getvalue()
+
+# Output formats by name: file extension, HTTP content type and the function
+# turning a ResumeDocument into bytes. Every entry can be picked with
+# --formats or a theme's "formats"; only "pdf" imports ReportLab.
+RENDERERS = {
+    "pdf": {"extension": ".pdf", "content_type": "application/pdf", "render": render_pdf},
+    "html": {"extension": ".html", "content_type": "text/html; charset=utf-8", "render": render_html},
+    "md": {"extension": ".md", "content_type": "text/markdown; charset=utf-8", "render": render_markdown},
+    "txt": {"extension": ".txt", "content_type": "text/plain; charset=utf-8", "render": render_text},
+}
+
+def output_files(filename, formats):
+    """{format: file} written for a job whose primary output is filename."""
+    stem = os.path.splitext(filename)[0]
+    return {fmt: stem + RENDERERS[fmt]["extension"] for fmt in formats}
+
+def _extra_formats(formats):
+    """' + html, txt' suffix naming the formats written next to the primary file."""
+    return f" + {', '.join(formats[1:])}" if len(formats) > 1 else ""
+
+def warm_format_cache(content):
+    """Highlight every summary, intro and bullet text once, filling FORMAT_CACHE."""
+    content = as_content(content)
+    for item in content.summary:
+        format_text_with_bold_tech(item.text)
+    for job in content.experience:
+        if job.intro.strip():
+            format_text_with_bold_tech(job.intro)
+        for bullet in job.bullets:
+            format_text_with_bold_tech(bullet.text)
+
+def render_pdf_bytes(content, target_audience, theme=None, index=None):
+    """Render one audience PDF in memory and return its bytes."""
+    buffer = io.BytesIO()
+    create_pdf(buffer, content, target_audience, theme=theme, index=index)
+    return buffer.getvalue()
+
+def render_outputs(content, target_audience, theme=None, index=None, formats=None):
+    """
+    Render one audience in every format of formats (default: the theme's)
+    from a single ResumeDocument. Returns {format: bytes}.
+    """
+    theme = theme or get_theme()
+    with profile_stage("model", target_audience):
+        document = build_resume_document(content, target_audience, index)
+    outputs = {}
+    for fmt in formats or theme.formats:
+        with profile_stage(f"render_{fmt}", target_audience):
+            outputs[fmt] = RENDERERS[fmt]["render"](document, theme)
+    return outputs
+
+def write_pdf_file(filename, pdf_bytes):
+    with open(filename, 'wb') as f:
+        f.write(pdf_bytes)
+
+def file_digest(path):
+    """SHA-256 of a file on disk."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+class DigestWriter:
+    """
+    A render_jobs writer that passes files on to another writer and records
+    the SHA-256 of each one by filename, for skipping unchanged artifacts.
+    """
+
+    def __init__(self, writer=write_pdf_file):
+        self.writer = writer
+        self.digests = {}
+
+    def __call__(self, filename, pdf_bytes):
+        self.writer(filename, pdf_bytes)
+        self.digests[filename] = hashlib.sha256(pdf_bytes).hexdigest()
+
+def write_checksums(path, digests):
+    """Write digests as 'sha256  filename' lines, the format sha256sum -c reads."""
+    with open(path, 'w', encoding='utf-8') as f:
+        for filename in sorted(digests):
+            f.write(f"{digests[filename]}  {filename}\n")
+
+def archive_epoch():
+    """Timestamp of reproducible archive members: SOURCE_DATE_EPOCH, else REPRODUCIBLE_EPOCH."""
+    try:
+        return int(os.environ["SOURCE_DATE_EPOCH"])
+    except (KeyError, ValueError):
+        return REPRODUCIBLE_EPOCH
+
+class PdfArchive:
+    """
+    Collects rendered PDFs into a single .zip, .tar, .tar.gz or .tgz file.
+    Use as a context manager and pass archive.add as the writer of
+    render_jobs(); PDFs go straight from memory into the archive. With a
+    reproducible theme every timestamp is SOURCE_DATE_EPOCH (else
+    REPRODUCIBLE_EPOCH), so identical PDFs give an identical archive.
+    """
+
+    def __init__(self, path):
+        import tarfile
+        import zipfile
+        self.path = path
+        self.mtime = archive_epoch() if get_theme().reproducible else None
+        self._files = []
+        lower = path.lower()
+        if lower.endswith(".zip"):
+            self.zip = zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED)
+            self.tar = None
+        elif lower.endswith((".tar.gz", ".tgz")):
+            import gzip
+            self.zip = None
+            # tarfile's own gzip header records the current time and the file name
+            raw = open(path, 'wb')
+            gz = gzip.GzipFile(filename="", mode='wb', fileobj=raw, mtime=self.mtime)
+            self._files = [gz, raw]
+            self.tar = tarfile.open(fileobj=gz, mode='w')
+        elif lower.endswith(".tar"):
+            self.zip = None
+            self.tar = tarfile.open(path, 'w')
+        else:
+            raise ValueError(f"Unsupported archive type: {path} (use .zip, .tar, .tar.gz or .tgz)")
+
+    def add(self, filename, pdf_bytes):
+        if self.zip is not None:
+            if self.mtime is None:
+                self.zip.writestr(filename, pdf_bytes)
+                return
+            import zipfile
+            info = zipfile.ZipInfo(filename, date_time=time.gmtime(max(self.mtime, ZIP_EPOCH))[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = 0o600 << 16
+            self.zip.writestr(info, pdf_bytes)
+        else:
+            import tarfile
+            info = tarfile.TarInfo(filename)
+            info.size = len(pdf_bytes)
+            info.mtime = int(time.time()) if self.mtime is None else self.mtime
+            info.mode = 0o644
+            info.uid = info.gid = 0
+            info.uname = info.gname = ""
+            self.tar.addfile(info, io.BytesIO(pdf_bytes))
+
+    def close(self):
+        (self.zip or self.tar).close()
+        for f in self._files:
+            f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def _timed_render(content, target_audience, index=None):
+    """
+    Render every format of the theme, returning (outputs, error, seconds)
+    instead of raising; outputs maps each format to its bytes.
+    """
+    start = time.perf_counter()
+    try:
+        outputs, error = render_outputs(content, target_audience, index=index), None
+    except Exception as e:
+        outputs, error = None, f"{type(e).__name__}: {e}"
+    if PROFILER is not None and outputs is not None:
+        PROFILER.note(target_audience, "bytes", sum(len(data) for data in outputs.values()))
+    return outputs, error, time.perf_counter() - start
+
+def write_outputs(writer, filename, outputs):
+    """Hand each format's bytes to writer under its file name (see output_files)."""
+    for fmt, path in output_files(filename, outputs).items():
+        writer(path, outputs[fmt])
+
+# Set once per worker process by _init_render_worker
+_WORKER_CONTENTS = None
+_WORKER_INDEXES = None
+
+def _init_render_worker(contents, cache_entries, theme_config, term_overlays, profile):
+    global _WORKER_CONTENTS, _WORKER_INDEXES
+    _WORKER_CONTENTS = contents
+    _WORKER_INDEXES = {key: content.index for key, content in contents.items()}
+    set_term_overlays(term_overlays)
+    FORMAT_CACHE.entries.update(cache_entries)
+    set_theme(Theme(**theme_config))
+    if profile:
+        enable_profiler()
+
+def _render_worker_task(content_key, target_audience):
+    result = _timed_render(_WORKER_CONTENTS[content_key], target_audience, _WORKER_INDEXES[content_key])
+    profile_data = PROFILER.drain() if PROFILER is not None else None
+    return result, profile_data, JOB_BLOCK_STATS.drain()
+
+def variant_sources(jobs_list, indexes):
+    """
+    For each job of jobs_list, the position of the first job rendering the
+    same content for an audience with the same selection (see
+    AudienceIndex.selection): its own position, or an earlier one whose
+    outputs it can share.
+    """
+    first = {}
+    return [
+        first.setdefault((key, indexes[key].selection(audience)), pos)
+        for pos, (key, audience, _) in enumerate(jobs_list)
+    ]
+
+def render_jobs(contents, jobs_list, jobs=1, writer=write_pdf_file, indexes=None):
+    """
+    Render a queue of audiences drawn from one or more content documents.
+    contents maps a key to validated content, and jobs_list holds
+    (content_key, audience, filename) tuples; filename names the primary
+    output and the theme's other formats are written next to it (see
+    output_files). Each file is rendered in memory and passed to
+    writer(filename, data), which defaults to a file write.
+    indexes optionally maps the same keys to prebuilt AudienceIndex objects.
+    Audiences of a document that see the same entries are rendered once and
+    the others get copies of those files, counted in VARIANT_STATS.
+    With jobs > 1 the renders run in a process pool. All contents, the
+    warmed format cache and the theme are sent to each worker once, at start-up.
+    Returns a list of (content_key, audience, filename, error, seconds) in
+    the order of jobs_list; copies report 0 seconds.
+    """
+    def finish(key, audience, filename, outputs, error, seconds):
+        if error is None:
+            try:
+                with profile_stage("write", audience):
+                    write_outputs(writer, filename, outputs)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+        return (key, audience, filename, error, seconds)
+
+    def collect(render):
+        # Write in jobs_list order, holding a render's outputs only until
+        # its last copy is written
+        pending = Counter(sources)
+        held = {}
+        results = []
+        for pos, (key, audience, filename) in enumerate(jobs_list):
+            source = sources[pos]
+            if source == pos:
+                held[pos] = render(pos)
+                outputs, error, seconds = held[pos]
+            else:
+                outputs, error, _ = held[source]
+                seconds = 0.0
+            pending[source] -= 1
+            if not pending[source]:
+                del held[source]
+            results.append(finish(key, audience, filename, outputs, error, seconds))
+        VARIANT_STATS.merge((len(jobs_list) - len(renders), len(renders)))
+        return results
+
+    contents = {key: as_content(content) for key, content in contents.items()}
+    indexes = dict(indexes or {})
+    for key in contents:
+        if key not in indexes:
+            indexes[key] = contents[key].index
+    sources = variant_sources(jobs_list, indexes)
+    renders = [pos for pos, source in enumerate(sources) if source == pos]
+
+    if jobs <= 1 or len(renders) <= 1:
+        def render(pos):
+            key, audience, _ = jobs_list[pos]
+            return _timed_render(contents[key], audience, indexes[key])
+
+        return collect(render)
+
+    from concurrent.futures import ProcessPoolExecutor
+    for content in contents.values():
+        warm_format_cache(content)
+    with ProcessPoolExecutor(
+        max_workers=min(jobs, len(renders)),
+        initializer=_init_render_worker,
+        initargs=(contents, dict(FORMAT_CACHE.entries), get_theme().config, _TERM_OVERLAYS, PROFILER is not None),
+    ) as executor:
+        futures = {
+            pos: executor.submit(_render_worker_task, jobs_list[pos][0], jobs_list[pos][1])
+            for pos in renders
+        }
+
+        def result(pos):
+            try:
+                (outputs, error, seconds), profile_data, block_counts = futures.pop(pos).result()
+            except Exception as e:
+                (outputs, error, seconds), profile_data, block_counts = (None, f"{type(e).__name__}: {e}", 0.0), None, (0, 0)
+            if profile_data is not None and PROFILER is not None:
+                PROFILER.merge(profile_data)
+            JOB_BLOCK_STATS.merge(block_counts)
+            return outputs, error, seconds
+
+        return collect(result)
+
+def render_audiences(content, targets, jobs=1, writer=write_pdf_file, index=None):
+    """
+    Render every (audience, filename) pair in targets for a single document.
+    Returns a list of (audience, filename, error) in the order of targets.
+    """
+    results = render_jobs(
+        {None: content},
+        [(None, audience, filename) for audience, filename in targets],
+        jobs=jobs,
+        writer=writer,
+        indexes={None: index} if index is not None else None,
+    )
+    return [(audience, filename, error) for _, audience, filename, error, _ in results]
+
+# =============================================================================
+# INCREMENTAL BUILDS
+# =============================================================================
+
+def _renderer_fingerprint():
+    """Hash of this script and pdf_renderer.py, so layout changes invalidate every output."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+    for name in (os.path.basename(__file__), "pdf_renderer.py"):
+        with open(os.path.join(here, name), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def audience_fingerprints(content, audiences, renderer_hash, index=None):
+    """
+    Fingerprint everything each audience PDF is built from: the filtered
+    summary/skills/experience, the shared fields, the term list, the theme
+    and the renderer.
+    Experience is walked once for all audiences, so streamed content is
+    read a single time. Returns {audience: fingerprint}.
+    """
+    content = as_content(content)
+    if index is None:
+        index = content.index
+    theme_hash = get_theme().fingerprint()
+
+    hashers = {}
+    for target_audience in audiences:
+        shared = {
+            "name": content.name,
+            "contact_info": content.contact_info,
+            "summary": [i.text for i in index.select(content.summary, "summary", target_audience)],
+            "skills": [i.text for i in index.select(content.skills, "skills", target_audience)],
+            "education": content.education,
+            "languages": content.languages,
+            "tech_terms": tech_terms_hash(),
+            "renderer": renderer_hash,
+            "theme": theme_hash,
+        }
+        payload = json.dumps(shared, sort_keys=True, ensure_ascii=False)
+        hashers[target_audience] = hashlib.sha256(payload.encode("utf-8"))
+
+    for job_idx, job in enumerate(content.experience):
+        for target_audience, hasher in hashers.items():
+            bullets = index.select(job.bullets, job_idx, target_audience)
+            if not bullets:
+                continue
+            selected = {
+                "title": job.title,
+                "company": job.company,
+                "dates": job.dates,
+                "intro": job.intro,
+                "bullets": [b.text for b in bullets],
+            }
+            payload = json.dumps(selected, sort_keys=True, ensure_ascii=False)
+            hasher.update(b"\n" + payload.encode("utf-8"))
+
+    return {aud: hasher.hexdigest() for aud, hasher in hashers.items()}
+
+def load_build_manifest(path):
+    """Load the audience -> {fingerprint, filename, digests} manifest, or {} if unusable."""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+def save_build_manifest(path, manifest):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=4, sort_keys=True)
+
+def reuse_unchanged(targets, fingerprints, manifest, formats=("pdf",)):
+    """
+    Split targets into those that must be rendered and those whose last
+    outputs (one file per format) can be reused. Outputs from an earlier
+    day are copied to today's date-stamped filenames instead of being
+    re-rendered.
+    Returns (to_render, reused) where reused is a list of (audience, filename, source).
+    """
+    to_render = []
+    reused = []
+    for audience, filename in targets:
+        entry = manifest.get(audience)
+        if (
+            not isinstance(entry, dict)
+            or entry.get("fingerprint") != fingerprints[audience]
+            or not isinstance(entry.get("digests"), dict)
+            or not all(os.path.exists(path) for path in output_files(entry.get("filename", ""), formats).values())
+        ):
+            to_render.append((audience, filename))
+            continue
+
+        source = entry["filename"]
+        if os.path.abspath(source) != os.path.abspath(filename):
+            import shutil
+            sources = output_files(source, formats)
+            for fmt, path in output_files(filename, formats).items():
+                shutil.copy2(sources[fmt], path)
+        reused.append((audience, filename, source))
+    return to_render, reused
+
+def render_targets(data, targets, fingerprints, manifest, jobs=1, index=None, incremental=True):
+    """
+    Render targets, skipping those reuse_unchanged can serve when incremental,
+    and record every audience's outputs with their SHA-256 per format in
+    manifest (failures are dropped from it).
+    Returns (results, reused) with results as (audience, filename, error).
+    """
+    formats = get_theme().formats
+    if incremental:
+        to_render, reused = reuse_unchanged(targets, fingerprints, manifest, formats)
+    else:
+        to_render, reused = targets, []
+
+    for audience, filename, _ in reused:
+        manifest[audience] = {
+            "fingerprint": fingerprints[audience],
+            "filename": filename,
+            "digests": manifest[audience]["digests"],
+        }
+
+    writer = DigestWriter()
+    with profile_stage("render"):
+        results = render_audiences(data, to_render, jobs=jobs, writer=writer, index=index)
+
+    for audience, filename, error in results:
+        if error is None:
+            manifest[audience] = {
+                "fingerprint": fingerprints[audience],
+                "filename": filename,
+                "digests": {fmt: writer.digests[path] for fmt, path in output_files(filename, formats).items()},
+            }
+        else:
+            manifest.pop(audience, None)
+    return results, reused
+
+def manifest_digests(manifest, targets):
+    """filename -> SHA-256 of every output file of the targets recorded in manifest."""
+    digests = {}
+    for audience, _ in targets:
+        entry = manifest.get(audience)
+        if entry and entry.get("digests"):
+            for fmt, path in output_files(entry["filename"], entry["digests"]).items():
+                digests[path] = entry["digests"][fmt]
+    return digests
+
+# =============================================================================
+# BATCH MODE
+# =============================================================================
+
+def find_content_files(source):
+    """Resolve a directory (all *.json inside) or a glob pattern to sorted paths."""
+    import glob
+    if os.path.isdir(source):
+        return sorted(glob.glob(os.path.join(source, "*.json")))
+    return sorted(glob.glob(source))
+
+def run_batch(source, output_dir, jobs=1, archive=None, max_errors=None, checksums=None, skill_index=None):
+    """
+    Render every candidate x audience combination found under source as one
+    job queue. Invalid files are recorded in the report instead of aborting.
+    With archive (a PdfArchive) the files are stored in it instead of output_dir.
+    Each output's SHA-256 goes into the report and, if given, the checksums file.
+    A SkillIndex is refreshed from the loaded content of every changed file.
+    Returns the report dictionary, which is also written to output_dir.
+    """
+    batch_start = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+    today_str = datetime.now().strftime("%Y_%b_%d")
+    formats = get_theme().formats
+
+    paths = find_content_files(source)
+    candidates = []
+    contents = {}
+    indexes = {}
+    jobs_list = []
+    used_filenames = set()
+    skill_counts = Counter()
+
+    for path in paths:
+        load_start = time.perf_counter()
+        data, error = read_content_file(path, max_errors)
+        entry = {
+            "path": path,
+            "status": "ok" if error is None else "invalid",
+            "load_seconds": round(time.perf_counter() - load_start, 4),
+            "render_seconds": 0.0,
+            "outputs": [],
+        }
+        candidates.append(entry)
+
+        if error is not None:
+            entry["errors"] = error.split("\n")
+            print(f"❌ Invalid: {path}")
+            if skill_index is not None:
+                skill_index.forget(path)
+            continue
+
+        if skill_index is not None:
+            skill_counts[skill_index.refresh(path, data)[0]] += 1
+        entry["name"] = data.name
+        contents[path] = data
+        indexes[path] = data.index
+        stem = os.path.splitext(os.path.basename(path))[0]
+        for audience in list_audiences(data, indexes[path]):
+            filename = output_filename(data, audience, today_str, formats[0])
+            if filename in used_filenames:
+                # Two candidates share a name; qualify with the content file name
+                filename = output_filename(data, f"{audience}_{stem}", today_str, formats[0])
+            used_filenames.add(filename)
+            if archive is None:
+                filename = os.path.join(output_dir, filename)
+            jobs_list.append((path, audience, filename))
+
+    writer = DigestWriter(archive.add if archive is not None else write_pdf_file)
+    results = render_jobs(contents, jobs_list, jobs=jobs, writer=writer, indexes=indexes)
+
+    by_path = {entry["path"]: entry for entry in candidates}
+    generated = failed = 0
+    for path, audience, filename, error, seconds in results:
+        entry = by_path[path]
+        entry["render_seconds"] = round(entry["render_seconds"] + seconds, 4)
+        output = {"audience": audience, "filename": filename, "seconds": round(seconds, 4)}
+        if error is None:
+            generated += 1
+            output["sha256"] = writer.digests[filename]
+            output["files"] = {path: writer.digests[path] for path in output_files(filename, formats).values()}
+            print(f"✓ Generated: {filename} (sha256 {output['sha256'][:12]}){_extra_formats(formats)}")
+        else:
+            failed += 1
+            output["error"] = error
+            entry["status"] = "failed"
+            print(f"❌ Failed: {filename} ({audience}): {error}")
+        entry["outputs"].append(output)
+
+    report = {
+        "source": source,
+        "files": len(paths),
+        "valid_files": len(contents),
+        "invalid_files": len(paths) - len(contents),
+        "pdfs_generated": generated,
+        "pdfs_failed": failed,
+        "jobs": jobs,
+        "elapsed_seconds": round(time.perf_counter() - batch_start, 4),
+        "format_cache": FORMAT_CACHE.stats(),
+        "job_block_cache": JOB_BLOCK_STATS.stats(),
+        "renders_saved": VARIANT_STATS.hits,
+        "candidates": candidates,
+    }
+    if skill_index is not None:
+        report["skill_index"] = {"indexed": skill_counts["indexed"], "unchanged": skill_counts["unchanged"]}
+    with open(os.path.join(output_dir, BATCH_REPORT_FILENAME), 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=4, ensure_ascii=False)
+    if checksums:
+        write_checksums(checksums, writer.digests)
+    return report
+
+# =============================================================================
+# SKILL INDEX
+# =============================================================================
+
+# Layout of the skill index database; an index written with another layout
+# or other term dictionaries is emptied and rebuilt
+_SKILL_INDEX_FORMAT = 2
+
+# audience_id of entries every audience sees (untagged bullets and intros,
+# and a summary or skills entry picked for every audience); the audiences
+# table numbers its rows from 1
+_EVERY_AUDIENCE = 0
+
+# audience_id of the summary or skills entry shown to audiences a file does
+# not name (file_audiences lists those it does)
+_OTHER_AUDIENCES = -1
+
+_SKILL_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY, path TEXT UNIQUE NOT NULL, size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL, sha256 TEXT NOT NULL, candidate TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    file_id INTEGER NOT NULL, job INTEGER NOT NULL, title TEXT, company TEXT, dates TEXT,
+    PRIMARY KEY (file_id, job)
+);
+CREATE TABLE IF NOT EXISTS terms (id INTEGER PRIMARY KEY, term TEXT UNIQUE NOT NULL, category TEXT);
+CREATE TABLE IF NOT EXISTS audiences (id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL);
+CREATE TABLE IF NOT EXISTS file_audiences (
+    file_id INTEGER NOT NULL, audience_id INTEGER NOT NULL, PRIMARY KEY (file_id, audience_id)
+);
+CREATE TABLE IF NOT EXISTS occurrences (
+    term_id INTEGER NOT NULL, audience_id INTEGER NOT NULL, file_id INTEGER NOT NULL,
+    section TEXT NOT NULL, job INTEGER, item INTEGER
+);
+CREATE INDEX IF NOT EXISTS occurrences_by_term ON occurrences (term_id, audience_id, file_id);
+CREATE INDEX IF NOT EXISTS occurrences_by_file ON occurrences (file_id);
+"""
+
+# What every queried term must share (query --within): the occurrence
+# columns a match is grouped by and the rows that can take part
+SKILL_QUERY_SCOPES = {
+    "candidate": (("file_id",), None),
+    "job": (("file_id", "job"), "o.job IS NOT NULL"),
+    "bullet": (("file_id", "job", "item"), "o.section = 'bullet'"),
+}
+
+def _skill_location(section, title, company, item):
+    """Where an occurrence is, e.g. 'summary' or 'Backend Engineer @ Acme, bullet 2'."""
+    if section in ("summary", "skills"):
+        return section
+    job = f"{title} @ {company}"
+    return f"{job} (intro)" if section == "intro" else f"{job}, bullet {item + 1}"
+
+class SkillIndex:
+    """
+    Persistent inverted index of the tech terms in a roster of content files.
+    Each (term, audience, file, entry) found by find_tech_terms is one row
+    in a SQLite database, so queries such as "Kubernetes and Go in backend
+    bullets" read neither content files nor the renderer. A file is read
+    again only when its size or mtime and then its SHA-256 change. Use as a
+    context manager; changes are committed on close.
+    """
+
+    def __init__(self, path=SKILL_INDEX_FILENAME):
+        import sqlite3
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.executescript(_SKILL_INDEX_SCHEMA)
+        self._term_ids = {}
+        self._audience_ids = {}
+        self._checked = False
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is not None:
+            self.db.rollback()
+        self.close()
+
+    def _version(self):
+        return f"{_SKILL_INDEX_FORMAT}:{tech_terms_hash()}"
+
+    def current(self):
+        """Whether the index was built with the current term dictionaries."""
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        return row is not None and row[0] == self._version()
+
+    def _check_version(self):
+        """Empty the index once if the dictionaries or the layout changed since it was built."""
+        if self._checked:
+            return
+        self._checked = True
+        if self.current():
+            return
+        for table in ("occurrences", "jobs", "file_audiences", "files", "terms", "audiences"):
+            self.db.execute(f"DELETE FROM {table}")
+        self.db.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (self._version(),))
+
+    def _row_id(self, table, column, value, cache, extra=()):
+        row_id = cache.get(value)
+        if row_id is None:
+            row = self.db.execute(f"SELECT id FROM {table} WHERE {column} = ?", (value,)).fetchone()
+            if row is None:
+                marks = ", ".join("?" * (1 + len(extra)))
+                row = (self.db.execute(f"INSERT INTO {table} VALUES (NULL, {marks})", (value, *extra)).lastrowid,)
+            row_id = cache[value] = row[0]
+        return row_id
+
+    def _term_id(self, term):
+        return self._row_id("terms", "term", term, self._term_ids, (term_index().categories.get(term),))
+
+    def _audience_id(self, name):
+        return self._row_id("audiences", "name", name, self._audience_ids)
+
+    def forget(self, path):
+        """Drop everything indexed for path."""
+        key = os.path.abspath(path)
+        row = self.db.execute("SELECT id FROM files WHERE path = ?", (key,)).fetchone()
+        if row is not None:
+            tables = (("occurrences", "file_id"), ("jobs", "file_id"), ("file_audiences", "file_id"), ("files", "id"))
+            for table, column in tables:
+                self.db.execute(f"DELETE FROM {table} WHERE {column} = ?", (row[0],))
+
+    def refresh(self, path, content=None, max_errors=None):
+        """
+        Bring path up to date. content is its Content when already loaded
+        (as in --batch); otherwise the file is parsed only if it changed.
+        Returns (status, error) with status "unchanged", "indexed" or "invalid".
+        """
+        self._check_version()
+        key = os.path.abspath(path)
+        try:
+            stamp = _file_stamp(path)
+            row = self.db.execute("SELECT id, size, mtime_ns, sha256 FROM files WHERE path = ?", (key,)).fetchone()
+            if row is not None and row[1:3] == stamp:
+                return "unchanged", None
+            digest = file_digest(path)
+        except OSError as e:
+            self.forget(path)
+            return "invalid", f"Error reading file: {e}"
+        if row is not None and row[3] == digest:
+            self.db.execute("UPDATE files SET size = ?, mtime_ns = ? WHERE id = ?", (*stamp, row[0]))
+            return "unchanged", None
+
+        if content is None:
+            content, error = read_content_file(path, max_errors)
+            if error is not None:
+                self.forget(path)
+                return "invalid", error
+        self.forget(path)
+        file_id = self.db.execute(
+            "INSERT INTO files VALUES (NULL, ?, ?, ?, ?, ?)", (key, *stamp, digest, content.name)
+        ).lastrowid
+        self._add_occurrences(file_id, content)
+        return "indexed", None
+
+    def _add_occurrences(self, file_id, content):
+        audience_ids = {name: self._audience_id(name) for name in content.audiences}
+        rows = []
+
+        def add(section, job, item, text, audiences):
+            if not audiences:
+                return
+            for term in find_tech_terms(text):
+                term_id = self._term_id(term)
+                rows.extend((term_id, audience_id, file_id, section, job, item) for audience_id in audiences)
+
+        def mask_audiences(mask):
+            if mask == ALL_AUDIENCES:
+                return (_EVERY_AUDIENCE,)
+            return [audience_ids[name] for name, bit in content.audiences.items() if mask & bit]
+
+        # Only the summary and skills entry each resume shows, picked by the
+        # same selection the renderer uses; None stands for the audiences
+        # this file does not name
+        selections = {name: content.index.selection(name) for name in content.audiences}
+        other = content.index.selection(None)
+        for section_idx, (section, items) in enumerate((("summary", content.summary), ("skills", content.skills))):
+            for pos, entry in enumerate(items):
+                audiences = [audience_ids[name] for name, selection in selections.items() if pos in selection[section_idx]]
+                if pos in other[section_idx]:
+                    audiences = [_EVERY_AUDIENCE] if len(audiences) == len(selections) else audiences + [_OTHER_AUDIENCES]
+                add(section, None, pos, entry.text, audiences)
+
+        jobs = []
+        for job_idx, job in enumerate(content.experience):
+            jobs.append((file_id, job_idx, job.title, job.company, job.dates))
+            # The intro is shown to every audience that sees one of the bullets
+            shown = 0
+            for pos, bullet in enumerate(job.bullets):
+                add("bullet", job_idx, pos, bullet.text, mask_audiences(bullet.mask))
+                shown |= bullet.mask
+            if job.intro.strip():
+                add("intro", job_idx, None, job.intro, mask_audiences(shown))
+
+        self.db.executemany("INSERT INTO jobs VALUES (?, ?, ?, ?, ?)", jobs)
+        self.db.executemany("INSERT INTO file_audiences VALUES (?, ?)", [(file_id, i) for i in audience_ids.values()])
+        self.db.executemany("INSERT INTO occurrences VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+    def update(self, paths, max_errors=None):
+        """Refresh every file of paths; returns a list of (path, status, error)."""
+        return [(path, *self.refresh(path, max_errors=max_errors)) for path in paths]
+
+    def prune(self):
+        """Forget indexed files that no longer exist; returns their paths."""
+        gone = [path for (path,) in self.db.execute("SELECT path FROM files") if not os.path.exists(path)]
+        for path in gone:
+            self.forget(path)
+        return gone
+
+    def totals(self):
+        """Indexed files, distinct terms and occurrence rows."""
+        def count(table):
+            return self.db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        return {"files": count("files"), "terms": count("terms"), "occurrences": count("occurrences")}
+
+    def query(self, terms, audience=None, within="candidate"):
+        """
+        Candidates (or jobs, or bullets, per within) mentioning every term of
+        terms, spelled as in the dictionary or as an alias. With audience,
+        only entries that audience's resume shows count: the summary and
+        skills entry it picks, and the bullets and intros tagged for it or
+        without target_audiences. Without it, entries some resume shows count.
+        Returns a list of {"candidate", "path", "title", "company", "bullet",
+        "terms": {term: [location, ...]}} sorted by candidate; title, company
+        and bullet are set for job and bullet matches only.
+        """
+        columns, scope = SKILL_QUERY_SCOPES[within]
+        wanted = list(dict.fromkeys(canonical_term(term) or term for term in terms))
+        marks = ", ".join("?" * len(wanted))
+        term_ids = [row[0] for row in self.db.execute(f"SELECT id FROM terms WHERE term IN ({marks})", wanted)]
+        if not wanted or len(term_ids) < len(wanted):
+            return []
+
+        where = [f"o.term_id IN ({marks})"]
+        params = list(term_ids)
+        if scope:
+            where.append(scope)
+        if audience is not None:
+            row = self.db.execute("SELECT id FROM audiences WHERE name = ?", (audience,)).fetchone()
+            audience_id = row[0] if row else None
+            where.append(
+                "(o.audience_id IN (?, ?) OR o.audience_id = ? AND o.file_id NOT IN "
+                "(SELECT file_id FROM file_audiences WHERE audience_id = ?))"
+            )
+            params += [_EVERY_AUDIENCE, audience_id, _OTHER_AUDIENCES, audience_id]
+        where = " AND ".join(where)
+        group = ", ".join(f"o.{column}" for column in columns)
+        join = " AND ".join(f"h.{column} = o.{column}" for column in columns)
+
+        rows = self.db.execute(f"""
+            WITH hits AS (
+                SELECT {", ".join(f"o.{column} AS {column}" for column in columns)}
+                FROM occurrences o WHERE {where}
+                GROUP BY {group} HAVING COUNT(DISTINCT o.term_id) = ?
+            )
+            SELECT DISTINCT f.candidate, f.path, o.job, o.item, o.section, t.term, j.title, j.company
+            FROM occurrences o
+            JOIN hits h ON {join}
+            JOIN files f ON f.id = o.file_id
+            JOIN terms t ON t.id = o.term_id
+            LEFT JOIN jobs j ON j.file_id = o.file_id AND j.job = o.job
+            WHERE {where}
+            ORDER BY f.candidate, f.path, o.job, o.section DESC, o.item
+        """, params + [len(term_ids)] + params).fetchall()
+
+        matches = {}
+        for candidate, path, job, item, section, term, title, company in rows:
+            key = (path, job, item)[:len(columns)]
+            match = matches.get(key)
+            if match is None:
+                match = matches[key] = {
+                    "candidate": candidate,
+                    "path": path,
+                    "title": title if within != "candidate" else None,
+                    "company": company if within != "candidate" else None,
+                    "bullet": item + 1 if within == "bullet" else None,
+                    "terms": {term: [] for term in wanted},
+                }
+            location = _skill_location(section, title, company, item)
+            if location not in match["terms"][term]:
+                match["terms"][term].append(location)
+        return list(matches.values())
+
+# =============================================================================
+# CONTENT COMMANDS (validate, audiences, stats, terms, index, query)
+# =============================================================================
+
+def expand_content_paths(sources):
+    """
+    Content files named by sources: directories (every *.json inside), globs
+    or plain paths. A source matching nothing is kept, so it is reported.
+    """
+    paths = []
+    for source in sources:
+        paths.extend(find_content_files(source) or [source])
+    return paths
+
+def run_validate_only(paths, max_errors=None):
+    """
+    Validate every file in paths without rendering anything.
+    Prints one line per file (plus its errors) and returns the number of invalid files.
+    """
+    invalid = 0
+    for path in paths:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            invalid += 1
+            print(f"❌ {path}: {e}")
+            continue
+
+        result = validate_content(data, max_errors)
+        if result.valid:
+            print(f"✓ {path} ({len(result.audiences)} audiences)")
+            continue
+
+        invalid += 1
+        print(f"❌ {path}")
+        for error in result.errors:
+            print(f"   {error}")
+        if result.truncated:
+            print(f"   (stopped after {len(result.errors)} error(s))")
+    return invalid
+
+def validate_paths(paths, max_errors=None):
+    """Validate paths, print the summary line and return the number of invalid files."""
+    if not paths:
+        print("⚠ No content files found.")
+    invalid = run_validate_only(paths, max_errors)
+    print(f"\n{'❌' if invalid else '✓'} {len(paths) - invalid} of {len(paths)} files valid.")
+    return invalid
+
+def run_audiences(path, max_errors=None):
+    """Print the audiences path would be rendered for, one per line. Returns 1 if invalid, else 0."""
+    data, error = read_content_file(path, max_errors)
+    if error is not None:
+        print(f"❌ {path}")
+        print(error)
+        return 1
+    for audience in list_audiences(data):
+        print(audience)
+    return 0
+
+def content_stats(data, index=None):
+    """
+    Section sizes of a document and what each audience gets, read from its
+    AudienceIndex alone (streamed experience is not read again).
+    """
+    data = as_content(data)
+    if index is None:
+        index = data.index
+
+    def size(key):
+        return len(index.sections.get(key, _EMPTY_SECTION)[0])
+
+    def universal(key):
+        return len(index.sections.get(key, _EMPTY_SECTION)[2])
+
+    job_keys = [key for key in index.sections if isinstance(key, int)]
+    audiences = {}
+    for audience in list_audiences(data, index):
+        shown = [len(index.positions(key, audience)) for key in job_keys]
+        audiences[audience] = {
+            "summary": bool(index.positions("summary", audience)),
+            "skills": bool(index.positions("skills", audience)),
+            "jobs": sum(1 for count in shown if count),
+            "bullets": sum(shown),
+        }
+    return {
+        "name": data.name,
+        "summaries": size("summary"),
+        "skills": size("skills"),
+        "jobs": len(job_keys),
+        "bullets": sum(size(key) for key in job_keys),
+        "universal_bullets": sum(universal(key) for key in job_keys),
+        "audiences": audiences,
+    }
+
+def run_stats(path, as_json=False, max_errors=None):
+    """Print content_stats for path as a table (or JSON). Returns 1 if invalid, else 0."""
+    data, error = read_content_file(path, max_errors)
+    if error is not None:
+        print(f"❌ {path}")
+        print(error)
+        return 1
+
+    stats = content_stats(data)
+    if as_json:
+        print(json.dumps(stats, indent=4, ensure_ascii=False))
+        return 0
+
+    print(f"{stats['name']} ({path})")
+    print(
+        f"{len(stats['audiences'])} audiences, {stats['jobs']} jobs, {stats['bullets']} bullets "
+        f"({stats['universal_bullets']} universal), {stats['summaries']} summaries, {stats['skills']} skills entries"
+    )
+    print(f"\n{'audience':<20}{'jobs':>6}{'bullets':>9}{'summary':>9}{'skills':>8}")
+    for audience, shown in stats["audiences"].items():
+        print(
+            f"{audience:<20}{shown['jobs']:>6}{shown['bullets']:>9}"
+            f"{'yes' if shown['summary'] else 'no':>9}{'yes' if shown['skills'] else 'no':>8}"
+        )
+    return 0
+
+def run_terms(lookups=()):
+    """
+    Load the term index (compiling and saving it if the dictionaries changed)
+    and summarise it; print the term each of lookups spells.
+    Returns 1 if a dictionary is invalid or a lookup is not a term, else 0.
+    """
+    start = time.perf_counter()
+    try:
+        index = term_index()
+    except (OSError, ValueError) as e:
+        print(f"❌ Invalid term dictionary: {e}")
+        return 1
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    print(f"✓ {'Loaded' if index.cached else 'Compiled'} term index in {elapsed_ms:.1f}ms: "
+          f"{len(index.terms)} terms, {len(index.aliases)} aliases")
+    for path in term_dictionary_paths():
+        print(f"  {path}")
+    if not lookups:
+        counts = {}
+        for category in index.categories.values():
+            counts[category] = counts.get(category, 0) + 1
+        print()
+        for category, count in counts.items():
+            print(f"{category:<36}{count:>6}")
+        return 0
+
+    failed = 0
+    for text in lookups:
+        term = canonical_term(text)
+        if term is None:
+            print(f"❌ {text}: not in the dictionary")
+            failed = 1
+        else:
+            print(f"✓ {text} -> {term} ({index.categories[term]})")
+    return failed
+
+def run_index(paths, db_path=SKILL_INDEX_FILENAME, max_errors=None):
+    """
+    Update the skill index at db_path with paths, reading only files that
+    changed, and forget indexed files that were deleted.
+    Prints a line per indexed or invalid file and returns the number of invalid files.
+    """
+    start = time.perf_counter()
+    try:
+        term_index()
+    except (OSError, ValueError) as e:
+        print(f"❌ Invalid term dictionary: {e}")
+        return 1
+
+    with SkillIndex(db_path) as skills:
+        counts = Counter()
+        for path, status, error in skills.update(paths, max_errors):
+            counts[status] += 1
+            if status == "indexed":
+                print(f"✓ Indexed: {path}")
+            elif status == "invalid":
+                print(f"❌ {path}")
+                print(error)
+        removed = skills.prune()
+        for path in removed:
+            print(f"✓ Removed: {path}")
+        totals = skills.totals()
+
+    print(
+        f"\n{'❌' if counts['invalid'] else '✓'} {counts['indexed']} indexed, {counts['unchanged']} unchanged, "
+        f"{counts['invalid']} invalid, {len(removed)} removed in {time.perf_counter() - start:.2f}s"
+    )
+    print(f"✓ {db_path}: {totals['files']} files, {totals['terms']} terms, {totals['occurrences']} occurrences")
+    return counts["invalid"]
+
+def run_query(terms, db_path=SKILL_INDEX_FILENAME, audience=None, within="candidate", as_json=False):
+    """
+    Print the candidates, jobs or bullets of the skill index mentioning every
+    term. Returns 1 if a term is not in the dictionary or the index is
+    missing, else 0.
+    """
+    if not os.path.exists(db_path):
+        print(f"❌ No skill index at {db_path}; build it with: python generate_resume.py index PATH...")
+        return 1
+    unknown = [term for term in terms if canonical_term(term) is None]
+    if unknown:
+        print(f"❌ Not in the term dictionary: {', '.join(unknown)}")
+        return 1
+
+    start = time.perf_counter()
+    with SkillIndex(db_path) as skills:
+        if not skills.current():
+            print("⚠ The skill index was built with other term dictionaries; run the index command again.")
+        matches = skills.query(terms, audience, within)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if as_json:
+        print(json.dumps(matches, indent=4, ensure_ascii=False))
+        return 0
+
+    wanted = " + ".join(dict.fromkeys(canonical_term(term) for term in terms))
+    scope = f" in one {within}" if within != "candidate" else ""
+    for_audience = f" for {audience}" if audience else ""
+    print(f"✓ {len(matches)} match(es) for {wanted}{scope}{for_audience} ({elapsed_ms:.1f}ms)")
+    for match in matches:
+        where = f"{match['title']} @ {match['company']}" if match["title"] is not None else ""
+        if match["bullet"] is not None:
+            where += f", bullet {match['bullet']}"
+        print(f"\n{match['candidate']}{' – ' + where if where else ''} ({os.path.relpath(match['path'])})")
+        if within != "bullet":
+            for term, locations in match["terms"].items():
+                print(f"  {term}: {'; '.join(locations)}")
+    return 0
+
+# =============================================================================
+# SERVER MODE
+# =============================================================================
+
+class QueueFullError(Exception):
+    """Raised when the render queue is at its configured depth limit."""
+
+class RenderMetrics:
+    """Thread-safe request counters and a rolling window of render latencies."""
+
+    def __init__(self, window=SERVER_LATENCY_WINDOW):
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.latencies = deque(maxlen=window)
+        self.requests = 0
+        self.rendered = 0
+        self.rejected = 0
+        self.errors = 0
+        self.in_flight = 0
+
+    def snapshot(self):
+        with self.lock:
+            latencies = sorted(self.latencies)
+            uptime = time.perf_counter() - self.started
+            snapshot = {
+                "uptime_seconds": round(uptime, 3),
+                "requests": self.requests,
+                "rendered": self.rendered,
+                "rejected": self.rejected,
+                "errors": self.errors,
+                "in_flight": self.in_flight,
+                "throughput_per_second": round(self.rendered / uptime, 3) if uptime else 0.0,
+            }
+
+        def percentile(p):
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 2)
+
+        snapshot["latency_ms"] = {
+            "p50": percentile(0.50),
+            "p95": percentile(0.95),
+            "p99": percentile(0.99),
+            "max": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+        }
+        return snapshot
+
+# Default document of a server worker and its index, set by _init_server_worker
+_SERVER_CONTENT = None
+_SERVER_INDEX = None
+
+def _init_server_worker(cache_entries, theme_config, term_overlays, content):
+    global _SERVER_CONTENT, _SERVER_INDEX
+    set_term_overlays(term_overlays)
+    FORMAT_CACHE.entries.update(cache_entries)
+    set_theme(Theme(**theme_config))
+    if content is not None:
+        _SERVER_CONTENT = content
+        _SERVER_INDEX = content.index
+
+def _render_server_task(content, target_audience, fmt="pdf"):
+    """Render request content, or the worker's default document when content is None."""
+    if content is None:
+        return render_outputs(_SERVER_CONTENT, target_audience, index=_SERVER_INDEX, formats=[fmt])[fmt]
+    return render_outputs(content, target_audience, formats=[fmt])[fmt]
+
+class RenderService:
+    """
+    Warm rendering backend for the HTTP server.
+    Keeps the default content validated in memory and renders on a process
+    pool whose workers have the highlighter, format cache and theme loaded.
+    At most max_queue requests may wait for a worker, on top of the jobs
+    renders in progress; further requests are rejected.
+    """
+
+    def __init__(self, content=None, jobs=1, max_queue=SERVER_MAX_QUEUE):
+        from concurrent.futures import ProcessPoolExecutor
+        self.content = content = as_content(content) if content is not None else None
+        self.index = content.index if content is not None else None
+        self.jobs = max(1, jobs)
+        self.max_queue = max_queue
+        self.metrics = RenderMetrics()
+        if content is not None:
+            warm_format_cache(content)
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.jobs,
+            initializer=_init_server_worker,
+            initargs=(dict(FORMAT_CACHE.entries), get_theme().config, _TERM_OVERLAYS, content),
+        )
+
+    def render(self, content, target_audience, fmt="pdf"):
+        """
+        Render one file in format fmt (a RENDERERS key) and return its bytes.
+        Raises QueueFullError when saturated. content=None renders the
+        default document the workers already hold.
+        """
+        metrics = self.metrics
+        with metrics.lock:
+            metrics.requests += 1
+            # Renders already running on a worker are not queued
+            if metrics.in_flight - self.jobs >= self.max_queue:
+                metrics.rejected += 1
+                raise QueueFullError(f"Render queue is full ({self.max_queue} waiting).")
+            metrics.in_flight += 1
+
+        start = time.perf_counter()
+        try:
+            data = self.executor.submit(_render_server_task, content, target_audience, fmt).result()
+        except Exception:
+            with metrics.lock:
+                metrics.errors += 1
+            raise
+        finally:
+            with metrics.lock:
+                metrics.in_flight -= 1
+
+        with metrics.lock:
+            metrics.rendered += 1
+            metrics.latencies.append(time.perf_counter() - start)
+        return data
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+
+class RenderRequestHandler:
+    """
+    Request handling of the render server, combined with
+    http.server.BaseHTTPRequestHandler by create_server.
+    POST /render   {"audience": "...", "content": {...}, "format": "pdf"} -> the rendered file
+                   ("content" is optional and defaults to the server's content file;
+                   "format" is any RENDERERS key and defaults to "pdf")
+    GET  /audiences                                     -> audiences of the default content
+    GET  /metrics                                       -> latency/throughput counters
+    """
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        service = self.server.service
+        if self.path == "/metrics":
+            self._send_json(200, service.metrics.snapshot())
+        elif self.path == "/audiences":
+            if service.content is None:
+                self._send_json(404, {"error": "Server has no default content."})
+            else:
+                self._send_json(200, {"audiences": list_audiences(service.content, service.index)})
+        else:
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+
+    def do_POST(self):
+        service = self.server.service
+        if self.path != "/render":
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except (ValueError, json.JSONDecodeError) as e:
+            self._send_json(400, {"error": f"Invalid JSON body: {e}"})
+            return
+        if not isinstance(payload, dict) or not isinstance(payload.get("audience"), str):
+            self._send_json(400, {"error": "Body must be an object with an 'audience' string."})
+            return
+        fmt = payload.get("format", "pdf")
+        if fmt not in RENDERERS:
+            self._send_json(400, {"error": f"Unknown format: {fmt!r} (use {', '.join(RENDERERS)})."})
+            return
+
+        content = payload.get("content")
+        if content is None:
+            if service.content is None:
+                self._send_json(400, {"error": "No 'content' given and the server has no default content."})
+                return
+        else:
+            if not isinstance(content, dict):
+                self._send_json(422, {"error": "'content' must be an object."})
+                return
+            is_valid, error_msg = validate_json_structure(content)
+            if not is_valid:
+                self._send_json(422, {"error": "Content validation failed.", "details": error_msg.split("\n")})
+                return
+            content = build_content(content)
+
+        try:
+            body = service.render(content, payload["audience"], fmt)
+        except QueueFullError:
+            self.send_response(503)
+            self.send_header("Retry-After", "1")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        except Exception as e:
+            self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", RENDERERS[fmt]["content_type"])
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+def create_server(service, host=SERVER_HOST, port=SERVER_PORT):
+    """Bind a threaded HTTP server for service. Use port 0 to pick a free port."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    handler = type("RenderRequestHandler", (RenderRequestHandler, BaseHTTPRequestHandler), {})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+# =============================================================================
+# WATCH MODE
+# =============================================================================
+
+def rebuild_watched(manifest, renderer_hash, jobs=1, max_errors=None):
+    """
+    One --watch rebuild: validate content.json and re-render only the
+    audiences whose fingerprint changed. An invalid file is reported and
+    leaves every existing PDF in place.
+    """
+    start = time.perf_counter()
+    data, error = read_content_file(JSON_FILENAME, max_errors)
+    if error is not None:
+        print(f"\n❌ {JSON_FILENAME} is invalid; keeping the last good PDFs:")
+        print(error)
+        return
+
+    index = data.index
+    today_str = datetime.now().strftime("%Y_%b_%d")
+    primary = get_theme().formats[0]
+    targets = [(audience, output_filename(data, audience, today_str, primary)) for audience in list_audiences(data, index)]
+    fingerprints = audience_fingerprints(data, [audience for audience, _ in targets], renderer_hash, index)
+
+    results, _ = render_targets(data, targets, fingerprints, manifest, jobs, index)
+    failures = report_results(results, manifest_digests(manifest, targets))
+    save_build_manifest(BUILD_MANIFEST_FILENAME, manifest)
+    FORMAT_CACHE.save(FORMAT_CACHE_FILENAME)
+
+    elapsed = time.perf_counter() - start
+    if not results:
+        print(f"↺ No audience affected ({elapsed:.2f}s)")
+    else:
+        print(f"{'⚠' if failures else '✓'} Re-rendered {len(results) - failures} of {len(targets)} audiences in {elapsed:.2f}s")
+
+def run_watch(jobs=1, interval=WATCH_INTERVAL, max_errors=None):
+    """
+    Rebuild affected audiences every time content.json changes, until Ctrl+C.
+    Polls the file's size and modification time, so it works on any platform
+    and with editors that replace the file on save.
+    """
+    FORMAT_CACHE.load(FORMAT_CACHE_FILENAME)
+    renderer_hash = _renderer_fingerprint()
+    manifest = load_build_manifest(BUILD_MANIFEST_FILENAME)
+    built_stamp = None
+    last_stamp = None
+
+    print(f"--- Watching {JSON_FILENAME} (Ctrl+C to stop) ---")
+    while True:
+        try:
+            stamp = _file_stamp(JSON_FILENAME)
+        except OSError:
+            stamp = None
+
+        if stamp is None and last_stamp is not None:
+            print(f"⚠ {JSON_FILENAME} disappeared; waiting for it to come back.")
+        elif stamp is not None and stamp == last_stamp and stamp != built_stamp:
+            if built_stamp is None:
+                print("\n--- Initial build ---")
+            else:
+                print(f"\n--- {JSON_FILENAME} changed ({datetime.now():%H:%M:%S}) ---")
+            rebuild_watched(manifest, renderer_hash, jobs, max_errors)
+            built_stamp = stamp
 
-        title_text = f"<font name='Helvetica-Bold' size=11>{job['title']}</font> | <font color='#555555'>{job['company']}</font>"
-        date_text = f"<font color='#555555'>{job['dates']}</font>"
-
-        row_data = [[
-            Paragraph(title_text, style_body),
-            Paragraph(date_text, ParagraphStyle('DateRight', parent=style_body, alignment=TA_RIGHT))
-        ]]
-        t_job = Table(row_data, colWidths=[5.5*inch, 2.0*inch], hAlign='LEFT')
-        t_job.setStyle(TableStyle([
-            ('LEFTPADDING', (0,0), (-1,-1), 0),
-            ('RIGHTPADDING', (0,0), (-1,-1), 0),
-            ('TOPPADDING', (0,0), (-1,-1), 2),
-            ('BOTTOMPADDING', (0,0), (-1,-1), 2),
-        ]))
-        story.append(t_job)
-
-        # Optional Intro
-        if "intro" in job and job["intro"].strip():
-            formatted_intro = format_text_with_bold_tech(job["intro"])
-            story.append(Paragraph(formatted_intro, style_body))
-            story.append(Spacer(1, 2))
-
-        for bullet in filtered_bullets:
-            formatted_bullet = format_text_with_bold_tech(bullet["text"])
-            story.append(Paragraph(f"•&nbsp;&nbsp;{formatted_bullet}", style_bullet))
-
-        story.append(Spacer(1, 2))
-
-    # Education
-    story.append(Paragraph("EDUCATION", style_section))
-    story.append(t_line)
-    story.append(Spacer(1, 2))
-    story.append(Paragraph(content.get("education", ""), style_body))
-
-    # Languages
-    story.append(Paragraph("LANGUAGES", style_section))
-    story.append(t_line)
-    story.append(Spacer(1, 2))
-    story.append(Paragraph(content.get("languages", ""), style_body))
-
-    doc.build(story)
-    print(f"✓ Generated: {filename}")
+        last_stamp = stamp
+        time.sleep(interval)
 
 # =============================================================================
 # MAIN EXECUTION
 # =============================================================================
 
-if __name__ == "__main__":
-    # 1. Load Data
-    data = load_content()
+def parse_args(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate PDF resumes for every target audience in content.json.")
+    parser.add_argument(
+        "--jobs", "-j", type=int, default=1,
+        help="Number of worker processes used to render audiences (default: 1)."
+    )
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help=f"Only re-render audiences whose content changed since the last run (tracked in {BUILD_MANIFEST_FILENAME})."
+    )
+    parser.add_argument(
+        "--batch", metavar="DIR_OR_GLOB",
+        help="Render every content file in a directory (or matching a glob) instead of content.json."
+    )
+    parser.add_argument(
+        "--output-dir", default=".",
+        help="Directory for generated PDFs in --batch mode (default: current directory)."
+    )
+    parser.add_argument(
+        "--theme", metavar="THEME_JSON",
+        help="JSON file overriding fonts, colors, sizes and margins (see DEFAULT_THEME)."
+    )
+    parser.add_argument(
+        "--terms", action="append", default=[], metavar="TERMS_JSON",
+        help=f"Tech-term dictionary applied over {TECH_TERMS_FILENAME} (terms, aliases, remove); repeat to stack overlays."
+    )
+    parser.add_argument(
+        "--skill-index", metavar="DB",
+        help=f"With --batch, also update this skill index from the loaded files (see the index and query commands; "
+             f"e.g. {SKILL_INDEX_FILENAME})."
+    )
+    parser.add_argument(
+        "--serve", action="store_true",
+        help="Run a local HTTP render server instead of writing PDFs (POST /render, GET /metrics)."
+    )
+    parser.add_argument(
+        "--host", default=SERVER_HOST,
+        help=f"Address for --serve (default: {SERVER_HOST})."
+    )
+    parser.add_argument(
+        "--port", type=int, default=SERVER_PORT,
+        help=f"Port for --serve (default: {SERVER_PORT})."
+    )
+    parser.add_argument(
+        "--max-queue", type=int, default=SERVER_MAX_QUEUE,
+        help=f"Requests allowed to wait for a worker in --serve before returning 503 (default: {SERVER_MAX_QUEUE})."
+    )
+    parser.add_argument(
+        "--archive", metavar="ARCHIVE",
+        help="Write all PDFs into one .zip/.tar/.tar.gz archive instead of separate files."
+    )
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="Print wall/CPU time per stage and audience, highlighter counters, pages and output sizes."
+    )
+    parser.add_argument(
+        "--profile-pstats", metavar="FILE",
+        help="With --profile, also dump cProfile stats of the main process to FILE."
+    )
+    parser.add_argument(
+        "--profile-trace", metavar="FILE",
+        help="With --profile, also write a Chrome trace-event JSON to FILE."
+    )
+    parser.add_argument(
+        "--validate-only", action="store_true",
+        help="Only validate content.json (or every --batch file); render nothing."
+    )
+    parser.add_argument(
+        "--max-errors", type=int, metavar="N",
+        help="Stop validating a file after N errors."
+    )
+    parser.add_argument(
+        "--fail-fast", action="store_true",
+        help="Stop validating a file at its first error (same as --max-errors 1)."
+    )
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="Keep running and re-render the affected audiences whenever content.json changes."
+    )
+    parser.add_argument(
+        "--watch-interval", type=float, default=WATCH_INTERVAL, metavar="SECONDS",
+        help=f"How often --watch checks content.json (default: {WATCH_INTERVAL})."
+    )
+    parser.add_argument(
+        "--max-pages", type=int, metavar="N",
+        help="Keep every PDF to N pages by tightening spacing and dropping the lowest-priority bullets."
+    )
+    parser.add_argument(
+        "--reproducible", action="store_true",
+        help="Byte-identical PDFs for identical content: fixed creation date (SOURCE_DATE_EPOCH or 2000-01-01) and stable IDs."
+    )
+    parser.add_argument(
+        "--checksums", metavar="FILE",
+        help="Write the SHA-256 of every output file to FILE in sha256sum format."
+    )
+    parser.add_argument(
+        "--formats", metavar="LIST",
+        help=f"Comma-separated output formats per audience, from {', '.join(RENDERERS)} (default: pdf). "
+             "All are rendered from one document model; the first names the reported file."
+    )
 
-    # 2. Identify all unique audiences
-    audiences = collect_all_audiences(data)
+    commands = parser.add_subparsers(
+        dest="command", metavar="COMMAND",
+        help="Inspect content, the term dictionaries or the skill index instead of rendering; none of these load ReportLab (see COMMAND --help)."
+    )
+    validate = commands.add_parser("validate", help="Validate content files and render nothing.")
+    validate.add_argument(
+        "paths", nargs="*", metavar="PATH",
+        help=f"Content files, directories or globs (default: {JSON_FILENAME})."
+    )
+    audiences = commands.add_parser("audiences", help="List the audiences of a content file, one per line.")
+    audiences.add_argument("path", nargs="?", default=JSON_FILENAME, help=f"Content file (default: {JSON_FILENAME}).")
+    stats = commands.add_parser("stats", help="Show section sizes and what each audience gets.")
+    stats.add_argument("path", nargs="?", default=JSON_FILENAME, help=f"Content file (default: {JSON_FILENAME}).")
+    stats.add_argument("--json", action="store_true", help="Print the statistics as JSON.")
+    terms = commands.add_parser("terms", help="Check the tech-term dictionaries, build their matcher index and look up terms.")
+    terms.add_argument("lookups", nargs="*", metavar="TEXT", help="Spellings to look up (e.g. k8s); exits 1 if one is not a term.")
+    index = commands.add_parser("index", help="Add content files to the skill index, reading only files that changed.")
+    index.add_argument(
+        "paths", nargs="*", metavar="PATH",
+        help=f"Content files, directories or globs (default: {JSON_FILENAME})."
+    )
+    query = commands.add_parser("query", help="Find candidates whose content mentions every given tech term.")
+    query.add_argument("query_terms", nargs="+", metavar="TERM", help="Terms or aliases, e.g. Kubernetes Go.")
+    query.add_argument(
+        "--audience",
+        help="Only count entries this audience's resume shows (tagged for it or untagged)."
+    )
+    query.add_argument(
+        "--within", choices=SKILL_QUERY_SCOPES, default="candidate",
+        help="Require every term in the same candidate (default), job or bullet."
+    )
+    query.add_argument("--json", action="store_true", help="Print the matches as JSON.")
+    for command in (index, query):
+        command.add_argument(
+            "--db", default=SKILL_INDEX_FILENAME,
+            help=f"Skill index database (default: {SKILL_INDEX_FILENAME})."
+        )
+    for command in (validate, audiences, stats, index):
+        command.add_argument("--max-errors", type=int, metavar="N", help="Stop validating a file after N errors.")
+        command.add_argument("--fail-fast", action="store_true", help="Stop validating a file at its first error.")
+
+    args = parser.parse_args(argv)
+    if args.formats is not None:
+        args.formats = [fmt.strip() for fmt in args.formats.split(",") if fmt.strip()]
+        unknown = [fmt for fmt in args.formats if fmt not in RENDERERS]
+        if unknown or not args.formats:
+            parser.error(f"--formats takes a comma-separated list of {', '.join(RENDERERS)}")
+    if args.max_pages is not None and args.max_pages < 1:
+        parser.error("--max-pages must be at least 1")
+    if args.skill_index and not args.batch:
+        parser.error("--skill-index works with --batch; use the index command for single files")
+    if args.fail_fast:
+        args.max_errors = 1
+    return args
+
+def report_results(results, digests=None):
+    """
+    Print one line per rendered audience (its primary file, with the SHA-256
+    if known, and any other formats) and return the number of failures.
+    """
+    digests = digests or {}
+    extra = _extra_formats(get_theme().formats)
+    failures = 0
+    for audience, filename, error in results:
+        if error is None and filename in digests:
+            print(f"✓ Generated: {filename} (sha256 {digests[filename][:12]}){extra}")
+        elif error is None:
+            print(f"✓ Generated: {filename}{extra}")
+        else:
+            failures += 1
+            print(f"❌ Failed: {filename} ({audience}): {error}")
+    return failures
+
+def finish_run(failures, total):
+    """Persist the format cache, print the run summary and exit 1 on failures."""
+    FORMAT_CACHE.save(FORMAT_CACHE_FILENAME)
+    cache_stats = FORMAT_CACHE.stats()
+    print(f"\n✓ Format cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+    block_stats = JOB_BLOCK_STATS.stats()
+    print(
+        f"✓ Job blocks: {block_stats['hits']} reused, {block_stats['misses']} built "
+        f"({block_stats['hit_rate']:.0%} hit rate)"
+    )
+    variant_stats = VARIANT_STATS.stats()
+    print(
+        f"✓ Variants: {variant_stats['misses']} rendered, "
+        f"{variant_stats['hits']} copied from an audience with identical content"
+    )
+
+    if PROFILER is not None:
+        PROFILER.finish()
+
+    if failures:
+        print(f"\n⚠ {failures} of {total} resumes failed.")
+        exit(1)
+
+    print("\n✓ All resumes generated successfully!")
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.terms:
+        set_term_overlays(args.terms)
+
+    # Content commands: no theme, format cache or ReportLab involved
+    if args.command is not None:
+        if args.command == "terms":
+            failed = run_terms(args.lookups)
+        elif args.command == "validate":
+            failed = validate_paths(expand_content_paths(args.paths or [JSON_FILENAME]), args.max_errors)
+        elif args.command == "audiences":
+            failed = run_audiences(args.path, args.max_errors)
+        elif args.command == "index":
+            failed = run_index(expand_content_paths(args.paths or [JSON_FILENAME]), args.db, args.max_errors)
+        elif args.command == "query":
+            failed = run_query(args.query_terms, args.db, args.audience, args.within, args.json)
+        else:
+            failed = run_stats(args.path, args.json, args.max_errors)
+        if failed:
+            exit(1)
+        return
+
+    if args.profile or args.profile_pstats or args.profile_trace:
+        enable_profiler(args.profile_pstats, args.profile_trace).start()
+    if args.theme:
+        try:
+            set_theme(Theme.from_file(args.theme))
+        except (OSError, ValueError, TypeError) as e:
+            print(f"❌ Invalid theme file '{args.theme}': {e}")
+            exit(1)
+    if args.max_pages:
+        set_theme(Theme(**{**get_theme().config, "max_pages": args.max_pages}))
+    if args.reproducible:
+        set_theme(Theme(**{**get_theme().config, "reproducible": True}))
+    if args.formats:
+        set_theme(Theme(**{**get_theme().config, "formats": args.formats}))
+
+    if args.archive and not args.archive.lower().endswith(ARCHIVE_EXTENSIONS):
+        print(f"❌ Unsupported archive type '{args.archive}' (use {', '.join(ARCHIVE_EXTENSIONS)}).")
+        exit(1)
+
+    if args.validate_only:
+        paths = find_content_files(args.batch) if args.batch else [JSON_FILENAME]
+        if validate_paths(paths, args.max_errors):
+            exit(1)
+        return
+
+    # Load the term index up front, so a bad dictionary fails once
+    try:
+        term_index()
+    except (OSError, ValueError) as e:
+        print(f"❌ Invalid term dictionary: {e}")
+        exit(1)
+
+    # Register the theme's fonts up front, so a bad font file fails once
+    if "pdf" in get_theme().formats:
+        try:
+            get_theme().pdf
+        except (OSError, ValueError) as e:
+            print(f"❌ Invalid theme: {e}")
+            exit(1)
+
+    if args.batch:
+        FORMAT_CACHE.load(FORMAT_CACHE_FILENAME)
+        print(f"--- Batch: {args.batch} ---")
+        with SkillIndex(args.skill_index) if args.skill_index else nullcontext() as skill_index:
+            if args.archive:
+                with PdfArchive(args.archive) as archive:
+                    report = run_batch(args.batch, args.output_dir, jobs=args.jobs, archive=archive,
+                                       max_errors=args.max_errors, checksums=args.checksums, skill_index=skill_index)
+                print(f"✓ Archive: {args.archive}")
+            else:
+                report = run_batch(args.batch, args.output_dir, jobs=args.jobs,
+                                   max_errors=args.max_errors, checksums=args.checksums, skill_index=skill_index)
+        FORMAT_CACHE.save(FORMAT_CACHE_FILENAME)
+        if PROFILER is not None:
+            PROFILER.finish()
+        print(
+            f"\n✓ {report['valid_files']} of {report['files']} files valid, "
+            f"{report['pdfs_generated']} PDFs generated ({report['renders_saved']} copied from identical audiences), "
+            f"{report['pdfs_failed']} failed in {report['elapsed_seconds']:.2f}s"
+        )
+        if "skill_index" in report:
+            print(
+                f"✓ Skill index {args.skill_index}: {report['skill_index']['indexed']} indexed, "
+                f"{report['skill_index']['unchanged']} unchanged"
+            )
+        print(f"✓ Report: {os.path.join(args.output_dir, BATCH_REPORT_FILENAME)}")
+        if report["invalid_files"] or report["pdfs_failed"]:
+            exit(1)
+        return
+
+    if args.serve:
+        FORMAT_CACHE.load(FORMAT_CACHE_FILENAME)
+        service = RenderService(load_content(args.max_errors), jobs=args.jobs, max_queue=args.max_queue)
+        server = create_server(service, args.host, args.port)
+        host, port = server.server_address[:2]
+        print(f"✓ Serving on http://{host}:{port} ({args.jobs} worker(s), queue limit {args.max_queue})")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\n✓ Shutting down.")
+        finally:
+            server.server_close()
+            service.shutdown()
+        return
+
+    if args.watch:
+        if not os.path.exists(JSON_FILENAME):
+            load_content(args.max_errors)
+        try:
+            run_watch(jobs=args.jobs, interval=args.watch_interval, max_errors=args.max_errors)
+        except KeyboardInterrupt:
+            FORMAT_CACHE.save(FORMAT_CACHE_FILENAME)
+            print("\n✓ Stopped watching.")
+        return
+
+    # 1. Load Data
+    with profile_stage("load"):
+        data = load_content(args.max_errors)
+    with profile_stage("format_cache_load"):
+        FORMAT_CACHE.load(FORMAT_CACHE_FILENAME)
+
+    # 2. Identify all unique audiences (sorted so output order is stable)
+    with profile_stage("collect_audiences"):
+        index = data.index
+        audiences = sorted(collect_all_audiences(data, index))
     if not audiences:
         print("⚠ No specific audiences found (e.g. 'fullstack', 'backend'). Generating a generic 'General' resume.")
-        audiences = {"General"}
+        audiences = ["General"]
     else:
         print(f"✓ Found target audiences: {', '.join(audiences)}")
 
-    # 3. Generate Filenames
+    # 3. Generate Filenames (the primary format's; other formats sit next to them)
     today_str = datetime.now().strftime("%Y_%b_%d")
+    primary = get_theme().formats[0]
+    targets = [(audience, output_filename(data, audience, today_str, primary)) for audience in audiences]
+
+    # 4. Stream everything into a single archive when requested
+    if args.archive:
+        print("\n--- Generating resumes ---")
+        with profile_stage("render"), PdfArchive(args.archive) as archive:
+            writer = DigestWriter(archive.add)
+            results = render_audiences(data, targets, jobs=args.jobs, writer=writer, index=index)
+        failures = report_results(results, writer.digests)
+        print(f"✓ Archive: {args.archive}")
+        if args.checksums:
+            write_checksums(args.checksums, writer.digests)
+            print(f"✓ Checksums: {args.checksums}")
+        finish_run(failures, len(targets))
+        return
+
+    # 5. Skip audiences whose content is unchanged since the last run
+    with profile_stage("fingerprint"):
+        renderer_hash = _renderer_fingerprint()
+        fingerprints = audience_fingerprints(data, [audience for audience, _ in targets], renderer_hash, index)
+        manifest = load_build_manifest(BUILD_MANIFEST_FILENAME)
+
+    # 6. Render the remaining audiences and report each file
+    print("\n--- Generating resumes ---")
+    results, reused = render_targets(data, targets, fingerprints, manifest, args.jobs, index, args.incremental)
+    for audience, filename, source in reused:
+        if source == filename:
+            print(f"↺ Unchanged: {filename}")
+        else:
+            print(f"↺ Unchanged: {filename} (copied from {source})")
+
+    digests = manifest_digests(manifest, targets)
+    failures = report_results(results, digests)
+    save_build_manifest(BUILD_MANIFEST_FILENAME, manifest)
+    if args.checksums:
+        write_checksums(args.checksums, digests)
+        print(f"✓ Checksums: {args.checksums}")
+    finish_run(failures, len(targets))
 
-    # Snake case the name for filename (e.g., "John Doe" -> "John_Doe")
-    raw_name = data.get("name", "Resume")
-    snake_name = raw_name.replace(" ", "_")
-
-    # 4. Loop through every audience found and create a resume
-    print("\n--- Generating PDFs ---")
-    for audience in audiences:
-        clean_audience = audience.capitalize().replace(" ", "_")
-        filename = f"{snake_name}_CV_{clean_audience}_{today_str}.pdf"
-        create_pdf(filename, data, target_audience=audience)
+if __name__ == "__main__":
+    main()
 
-    print("\n✓ All resumes generated successfully!")
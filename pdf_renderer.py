@@ -0,0 +1,482 @@
+import io
+from collections import OrderedDict
+
+from reportlab.lib.pagesizes import LETTER
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.lib.units import inch
+from reportlab.lib.enums import TA_LEFT, TA_RIGHT
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFError, TTFont
+
+# The ReportLab half of generate_resume.py: fonts, paragraph styles, shared
+# flowables and the PDF story of a ResumeDocument. generate_resume imports
+# it on the first PDF render, so the text, Markdown and HTML formats never
+# load ReportLab.
+
+# =============================================================================
+# CONSTANTS & CONFIG
+# =============================================================================
+
+# Documents whose shared flowables (StoryParts) are kept between renders
+STORY_PARTS_CACHE_SIZE = 8
+
+# SimpleDocTemplate's frame pads the page body by 6pt on every side
+FRAME_PADDING = 6
+
+# =============================================================================
+# FONTS
+# =============================================================================
+
+# Font name -> TrueType file registered with ReportLab in this process
+_REGISTERED_FONTS = {}
+
+# TrueType file -> its raw bytes, read once per process
+_FONT_DATA = {}
+
+def load_font_data(path):
+    """Raw bytes of a TrueType file, read once per process."""
+    data = _FONT_DATA.get(path)
+    if data is None:
+        with open(path, 'rb') as f:
+            data = _FONT_DATA[path] = f.read()
+    return data
+
+def register_ttf(name, path):
+    """
+    Register a TrueType font under name, once per process.
+    ReportLab embeds only the glyphs each document uses (one subset per 256
+    characters), so every audience PDF carries just its own glyphs.
+    """
+    if _REGISTERED_FONTS.get(name) == path:
+        return
+    try:
+        font = TTFont(name, io.BytesIO(load_font_data(path)))
+    except TTFError as e:
+        raise ValueError(f"Cannot load font '{path}': {e}") from None
+    pdfmetrics.registerFont(font)
+    _REGISTERED_FONTS[name] = path
+
+def register_theme_fonts(cfg):
+    """Register the theme's TrueType files and map <b> in paragraphs to its bold face."""
+    if not cfg["font_file"] and not cfg["font_bold_file"]:
+        return
+    if cfg["font_file"]:
+        register_ttf(cfg["font"], cfg["font_file"])
+    if cfg["font_bold_file"]:
+        register_ttf(cfg["font_bold"], cfg["font_bold_file"])
+    pdfmetrics.registerFontFamily(
+        cfg["font"], normal=cfg["font"], bold=cfg["font_bold"],
+        italic=cfg["font"], boldItalic=cfg["font_bold"],
+    )
+
+# =============================================================================
+# STYLES
+# =============================================================================
+
+class PdfStyles:
+    """
+    The ReportLab styles of a theme, built from its config.
+    Created once per Theme (see Theme.pdf) and reused for every document,
+    so rendering another audience or candidate costs nothing for styling.
+    """
+
+    def __init__(self, cfg):
+        register_theme_fonts(cfg)
+
+        self.font = cfg["font"]
+        self.font_bold = cfg["font_bold"]
+        self.color_link = cfg["color_link"]
+        self.color_secondary = cfg["color_secondary"]
+        self.job_title_size = cfg["job_title_size"]
+        self.reproducible = cfg["reproducible"]
+        self.page_width = LETTER[0]
+        self.margins = {
+            "leftMargin": cfg["margin_left"] * inch,
+            "rightMargin": cfg["margin_right"] * inch,
+            "topMargin": cfg["margin_top"] * inch,
+            "bottomMargin": cfg["margin_bottom"] * inch,
+        }
+        self.content_width = self.page_width - self.margins["leftMargin"] - self.margins["rightMargin"]
+
+        normal = getSampleStyleSheet()['Normal']
+
+        self.style_name = ParagraphStyle(
+            'NameTitle',
+            parent=normal,
+            fontName=self.font_bold,
+            fontSize=cfg["name_size"],
+            textColor=colors.HexColor(cfg["color_primary"]),
+            leading=cfg["name_size"] + 4,
+            spaceAfter=4
+        )
+
+        self.style_contact = ParagraphStyle(
+            'Contact',
+            parent=normal,
+            fontName=self.font,
+            fontSize=cfg["contact_size"],
+            textColor=colors.HexColor(cfg["color_muted"]),
+            alignment=TA_RIGHT,
+            leading=cfg["contact_size"] + 2
+        )
+
+        self.style_section = ParagraphStyle(
+            'SectionHeader',
+            parent=normal,
+            fontName=self.font_bold,
+            fontSize=cfg["section_size"],
+            textColor=colors.HexColor(cfg["color_primary"]),
+            spaceBefore=6,
+            spaceAfter=2
+        )
+
+        self.style_body = ParagraphStyle(
+            'BodyText',
+            parent=normal,
+            fontName=self.font,
+            fontSize=cfg["body_size"],
+            leading=cfg["body_size"] + 4,
+            alignment=TA_LEFT,
+            leftIndent=0,
+            firstLineIndent=0,
+            spaceAfter=4
+        )
+
+        self.style_date = ParagraphStyle('DateRight', parent=self.style_body, alignment=TA_RIGHT)
+
+        self.style_bullet = ParagraphStyle(
+            'Bullet',
+            parent=normal,
+            fontName=self.font,
+            fontSize=cfg["body_size"],
+            leading=cfg["body_size"] + 3,
+            leftIndent=16,
+            firstLineIndent=-10,
+            spaceAfter=2
+        )
+
+        self.header_col_widths = [cfg["header_name_width"] * inch, self.content_width - cfg["header_name_width"] * inch]
+        self.header_table_style = TableStyle([
+            ('VALIGN', (0,0), (-1,-1), 'BOTTOM'),
+            ('LEFTPADDING', (0,0), (-1,-1), 0),
+            ('RIGHTPADDING', (0,0), (-1,-1), 0),
+        ])
+
+        self.job_col_widths = [self.content_width - cfg["job_date_width"] * inch, cfg["job_date_width"] * inch]
+        self.job_table_style = TableStyle([
+            ('LEFTPADDING', (0,0), (-1,-1), 0),
+            ('RIGHTPADDING', (0,0), (-1,-1), 0),
+            ('TOPPADDING', (0,0), (-1,-1), 2),
+            ('BOTTOMPADDING', (0,0), (-1,-1), 2),
+        ])
+
+        # Section separator line, shared by every section of every document
+        self.t_line = Table([[""]], colWidths=[self.content_width], rowHeights=1)
+        self.t_line.setStyle(TableStyle([('LINEABOVE', (0,0), (-1,-1), 1, colors.HexColor(cfg["color_rule"]))]))
+
+# =============================================================================
+# STORY PARTS
+# =============================================================================
+
+class SharedParagraph(Paragraph):
+    """
+    A Paragraph reused by every document built from the same content.
+    Line breaking depends only on the text, style and width, so the last
+    wrap() is kept and returned again for the same width. split() hands out
+    new Paragraphs and leaves this one intact; if it discards the line
+    breaks, the next wrap() recomputes them.
+    """
+
+    def wrap(self, availWidth, availHeight):
+        if availWidth == getattr(self, "_wrapped_width", None) and hasattr(self, "blPara"):
+            return self.width, self.height
+        size = super().wrap(availWidth, availHeight)
+        self._wrapped_width = availWidth
+        return size
+
+def release_flowables(flowables):
+    """
+    Clear the per-build state doc.build() leaves on flowables, so a shared
+    flowable moved to a new page in one document is not taken for one that
+    cannot fit at all in the next.
+    """
+    for flowable in flowables:
+        flowable.__dict__.pop("_postponed", None)
+
+def new_document(target, styles):
+    """SimpleDocTemplate writing to target with the theme's page setup and output mode."""
+    # invariant=None leaves ReportLab's own RL_invariant setting in charge
+    return SimpleDocTemplate(
+        target,
+        pagesize=LETTER,
+        invariant=True if styles.reproducible else None,
+        **styles.margins
+    )
+
+def build_document(doc, story, document_id=None):
+    """
+    doc.build(story) for stories that may contain shared flowables.
+    In invariant mode ReportLab derives the PDF /ID from the fixed timestamp
+    alone, so every file would get the same ID. A document_id is mixed in
+    to give each document its own ID that is stable between runs.
+    """
+    flowables = list(story)
+    on_first_page = lambda canv, _: None
+    if document_id is not None:
+        on_first_page = lambda canv, _: canv._doc.updateSignature(document_id)
+    try:
+        doc.build(story, onFirstPage=on_first_page)
+    finally:
+        release_flowables(flowables)
+
+class StoryParts:
+    """
+    Flowables that are identical in every audience variant of a document:
+    the header table, section headings, summary/skills paragraphs,
+    education and languages, and each job's title row, intro and bullets.
+    Whole job blocks are also kept per bullet selection, since audiences
+    often pick exactly the same bullets of a job; lookups are counted in
+    block_stats (a HitCounter) when one is given.
+    They are built on first use and reused by later audiences. Documents in
+    one process are built one at a time, and build_document resets the
+    little state a build leaves behind.
+    Jobs of streamed documents are not kept, so streaming stays bounded.
+    """
+
+    def __init__(self, document, styles, block_stats=None):
+        self.content = document.content
+        self.styles = styles
+        self.keep_jobs = not document.streamed
+        self.block_stats = block_stats
+        self._summary = {}
+        self._skills = {}
+        self._sections = {}
+        self._jobs = {}
+        self._bullets = {}
+        self._blocks = {}
+
+        c_info = document.contact_info
+
+        phone = c_info.get("phone", "")
+        email = c_info.get("email", "")
+
+        # Build contact parts list
+        contact_parts = []
+        if phone:
+            contact_parts.append(phone)
+        if email:
+            contact_parts.append(email)
+
+        # Optional URLs
+        linkedin = c_info.get("linkedin_url", "").strip()
+        if linkedin:
+            contact_parts.append(f"<a href='{linkedin}' color='{styles.color_link}'>LinkedIn</a>")
+
+        github = c_info.get("github_url", "").strip()
+        if github:
+            contact_parts.append(f"<a href='{github}' color='{styles.color_link}'>GitHub</a>")
+
+        current_contact_info = " | ".join(contact_parts)
+
+        header_data = [[SharedParagraph(document.name, styles.style_name), SharedParagraph(current_contact_info, styles.style_contact)]]
+        self.header = Table(header_data, colWidths=styles.header_col_widths)
+        self.header.setStyle(styles.header_table_style)
+
+        self.education = SharedParagraph(document.education, styles.style_body)
+        self.languages = SharedParagraph(document.languages, styles.style_body)
+
+    def section(self, title):
+        """Heading, rule and spacer that open a section."""
+        heading = self._sections.get(title)
+        if heading is None:
+            heading = self._sections[title] = SharedParagraph(title, self.styles.style_section)
+        return [heading, self.styles.t_line, Spacer(1, 2)]
+
+    def summary(self, pos, markup):
+        paragraph = self._summary.get(pos)
+        if paragraph is None:
+            paragraph = self._summary[pos] = SharedParagraph(markup, self.styles.style_body)
+        return paragraph
+
+    def skills(self, pos, markup):
+        paragraph = self._skills.get(pos)
+        if paragraph is None:
+            paragraph = self._skills[pos] = SharedParagraph(markup, self.styles.style_body)
+        return paragraph
+
+    def job_header(self, job):
+        """(title/date row, intro paragraph or None) for a ResumeJob."""
+        cached = self._jobs.get(job.index)
+        if cached is not None:
+            return cached
+
+        styles = self.styles
+        title_text = (
+            f"<font name='{styles.font_bold}' size={styles.job_title_size}>{job.title}</font>"
+            f" | <font color='{styles.color_secondary}'>{job.company}</font>"
+        )
+        date_text = f"<font color='{styles.color_secondary}'>{job.dates}</font>"
+
+        row_data = [[
+            SharedParagraph(title_text, styles.style_body),
+            SharedParagraph(date_text, styles.style_date)
+        ]]
+        t_job = Table(row_data, colWidths=styles.job_col_widths, hAlign='LEFT')
+        t_job.setStyle(styles.job_table_style)
+
+        intro = None
+        if job.intro is not None:
+            intro = SharedParagraph(job.intro, styles.style_body)
+
+        if self.keep_jobs:
+            self._jobs[job.index] = (t_job, intro)
+        return t_job, intro
+
+    def job_block(self, job, bullets):
+        """
+        Flowables of a job showing bullets, a list of (position, markup):
+        title row, optional intro, bullets and closing spacer. Cached by
+        (job index, positions).
+        """
+        key = (job.index, tuple(pos for pos, _ in bullets))
+        block = self._blocks.get(key)
+        if block is not None:
+            if self.block_stats is not None:
+                self.block_stats.hits += 1
+            return block
+        if self.block_stats is not None:
+            self.block_stats.misses += 1
+
+        t_job, intro = self.job_header(job)
+        block = [t_job]
+        if intro is not None:
+            block.append(intro)
+            block.append(Spacer(1, 2))
+        block.extend(self.bullet(job.index, pos, markup) for pos, markup in bullets)
+        block.append(Spacer(1, 2))
+
+        block = tuple(block)
+        if self.keep_jobs:
+            self._blocks[key] = block
+        return block
+
+    def bullet(self, job_idx, pos, markup):
+        paragraph = self._bullets.get((job_idx, pos))
+        if paragraph is None:
+            paragraph = SharedParagraph(f"•&nbsp;&nbsp;{markup}", self.styles.style_bullet)
+            if self.keep_jobs:
+                self._bullets[(job_idx, pos)] = paragraph
+        return paragraph
+
+# Most recently used StoryParts, keyed by id(content); each entry holds its
+# content, so an id cannot be reused while the entry exists
+_STORY_PARTS = OrderedDict()
+
+def story_parts(document, styles, block_stats=None):
+    """
+    The StoryParts for the document's content and these styles, built on
+    first use. Content is matched by identity, so edit a loaded document by
+    loading it again.
+    """
+    key = id(document.content)
+    parts = _STORY_PARTS.get(key)
+    if parts is not None and parts.content is document.content and parts.styles is styles:
+        _STORY_PARTS.move_to_end(key)
+        return parts
+
+    parts = StoryParts(document, styles, block_stats)
+    _STORY_PARTS[key] = parts
+    _STORY_PARTS.move_to_end(key)
+    while len(_STORY_PARTS) > STORY_PARTS_CACHE_SIZE:
+        _STORY_PARTS.popitem(last=False)
+    return parts
+
+def build_story(document, styles, drop=frozenset(), block_stats=None):
+    """
+    The list of flowables for a ResumeDocument, without laying it out.
+    Everything but the spacers comes from the content's StoryParts, so only
+    the selection differs between audiences.
+    drop holds (job index, bullet position) pairs to leave out; a job left
+    without bullets is skipped.
+    """
+    parts = story_parts(document, styles, block_stats)
+    titles = document.titles
+
+    story = []
+
+    # Header
+    story.append(parts.header)
+    story.append(Spacer(1, 2))
+
+    # Summary
+    if document.summary is not None:
+        story.append(parts.summary(*document.summary))
+        story.append(Spacer(1, 1))
+
+    # Skills
+    story.extend(parts.section(titles["skills"]))
+    if document.skills is not None:
+        story.append(parts.skills(*document.skills))
+
+    story.append(Spacer(1, 1))
+
+    # Experience
+    story.extend(parts.section(titles["experience"]))
+
+    for job in document.jobs:
+        bullets = [(pos, markup) for pos, markup, _ in job.bullets]
+        if drop:
+            bullets = [(pos, markup) for pos, markup in bullets if (job.index, pos) not in drop]
+        if not bullets:
+            continue
+
+        # Title row, optional intro, bullets and spacer
+        story.extend(parts.job_block(job, bullets))
+
+    # Education
+    story.extend(parts.section(titles["education"]))
+    story.append(parts.education)
+
+    # Languages
+    story.extend(parts.section(titles["languages"]))
+    story.append(parts.languages)
+
+    return story
+
+# =============================================================================
+# LAYOUT ESTIMATE
+# =============================================================================
+
+def estimate_pages(story, doc, slack=0):
+    """
+    Pages story would need in doc, measured with wrap() alone.
+    Follows the frame's spacing rules; paragraphs may continue on the next
+    page and other flowables move there whole. slack shortens every page,
+    to make up for an estimate a real build proved optimistic.
+    """
+    width = doc.width - 2 * FRAME_PADDING
+    height = doc.height - 2 * FRAME_PADDING - slack
+    pages = 1
+    room = height
+    prev_after = 0
+    for flowable in story:
+        _, h = flowable.wrap(width, height)
+        space = 0 if room == height else max(flowable.getSpaceBefore() - prev_after, 0)
+        if h + space > room and room < height:
+            if isinstance(flowable, Paragraph):
+                h -= max(room - space, 0)
+            pages += 1
+            room = height
+            space = 0
+            while h > room:
+                pages += 1
+                h -= room
+        prev_after = flowable.getSpaceAfter()
+        room -= h + space + prev_after
+    return pages
+
+def tighten(story):
+    """The story without its decorative spacers."""
+    return [flowable for flowable in story if not isinstance(flowable, Spacer)]
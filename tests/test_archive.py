@@ -0,0 +1,47 @@
+"""
+PdfArchive under --reproducible: identical PDFs give identical archives.
+"""
+
+import tarfile
+import time
+
+import pytest
+
+import generate_resume as gr
+
+MEMBERS = [("Jane_Backend.pdf", b"%PDF-1.4 backend"), ("Jane_Frontend.pdf", b"%PDF-1.4 frontend")]
+
+
+@pytest.fixture
+def reproducible():
+    theme = gr.get_theme()
+    gr.set_theme(gr.Theme(**{**theme.config, "reproducible": True}))
+    yield
+    gr.set_theme(theme)
+
+
+def write_archive(path, now, monkeypatch):
+    monkeypatch.setattr(time, "time", lambda: now)
+    with gr.PdfArchive(str(path)) as archive:
+        for filename, data in MEMBERS:
+            archive.add(filename, data)
+    monkeypatch.undo()
+    return path.read_bytes()
+
+
+@pytest.mark.parametrize("suffix", [".zip", ".tar", ".tar.gz"])
+def test_reproducible_archive_ignores_the_clock(tmp_path, monkeypatch, reproducible, suffix):
+    monkeypatch.delenv("SOURCE_DATE_EPOCH", raising=False)
+    first = write_archive(tmp_path / f"a{suffix}", 1_700_000_000, monkeypatch)
+    second = write_archive(tmp_path / f"b{suffix}", 1_800_000_000, monkeypatch)
+    assert first == second
+
+
+def test_reproducible_tar_uses_source_date_epoch(tmp_path, monkeypatch, reproducible):
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1600000000")
+    path = tmp_path / "a.tar.gz"
+    with gr.PdfArchive(str(path)) as archive:
+        archive.add(*MEMBERS[0])
+    with tarfile.open(path) as tar:
+        member = tar.getmember(MEMBERS[0][0])
+    assert (member.mtime, member.uid, member.gid, member.uname, member.gname) == (1600000000, 0, 0, "", "")
@@ -0,0 +1,175 @@
+"""
+Parity of format_text_with_bold_tech (one pass of the term matcher) with the
+per-term re.sub loop it replaced, run over the same dictionary.
+"""
+
+import json
+import os
+import random
+import re
+
+import pytest
+
+import generate_resume as gr
+
+_TAG = re.compile(r"<(/?)([a-zA-Z]+)[^>]*>")
+
+
+def baseline_patterns(terms):
+    """The patterns of the original highlighter, longest term first."""
+    patterns = []
+    for term in sorted(terms, key=len, reverse=True):
+        escaped_term = re.escape(term)
+        pattern = r"(<b>" + escaped_term + r"</b>)|((?<![a-zA-Z0-9])" + escaped_term + r"(?![a-zA-Z0-9]))"
+        patterns.append(re.compile(pattern, re.IGNORECASE))
+    return patterns
+
+
+def baseline_highlight(text, patterns):
+    """
+    The original highlighter: one re.sub per term. It compiled each pattern
+    on every call; here they are compiled once, which changes nothing else.
+    """
+    def replace_func(match):
+        if match.group(1): return match.group(1)
+        return f"<b>{match.group(2)}</b>"
+
+    for pattern in patterns:
+        text = pattern.sub(replace_func, text)
+    return text
+
+
+def bold_mask(markup):
+    """
+    (plain text, positions of bold characters) of markup. Nested <b> runs
+    count once, so the old loop's <b><b>React</b> Hook Form</b> compares
+    equal to <b>React Hook Form</b>.
+    """
+    plain = []
+    bold = set()
+    depth = 0
+    pos = 0
+    for match in _TAG.finditer(markup):
+        for char in markup[pos:match.start()]:
+            if depth:
+                bold.add(len(plain))
+            plain.append(char)
+        if match.group(2).lower() == "b":
+            depth += -1 if match.group(1) else 1
+        pos = match.end()
+    for char in markup[pos:]:
+        if depth:
+            bold.add(len(plain))
+        plain.append(char)
+    return "".join(plain), bold
+
+
+@pytest.fixture(scope="module")
+def all_terms():
+    index = gr.term_index()
+    return list(index.terms) + list(index.aliases)
+
+
+@pytest.fixture(scope="module")
+def baseline(all_terms):
+    patterns = baseline_patterns(all_terms)
+    return lambda text: baseline_highlight(text, patterns)
+
+
+@pytest.fixture(autouse=True)
+def empty_format_cache():
+    gr.FORMAT_CACHE.entries.clear()
+
+
+def content_texts():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with open(os.path.join(root, "content.json"), encoding="utf-8") as f:
+        data = json.load(f)
+    texts = [item["text"] for item in data["summary"] + data["skills"]]
+    for job in data["experience"]:
+        texts.append(job["intro"])
+        texts.extend(bullet["text"] for bullet in job["bullets"])
+    return [text for text in texts if text.strip()]
+
+
+def synthetic_texts(terms, count=300, seed=0):
+    rng = random.Random(seed)
+    fillers = ["built", "the", "platform", "with", "and", "using", "for", "team", "(", ")", ",", ";", "/"]
+    texts = []
+    for _ in range(count):
+        words = []
+        for _ in range(rng.randint(6, 20)):
+            word = rng.choice(terms) if rng.random() < 0.3 else rng.choice(fillers)
+            words.append(rng.choice([word, word.lower(), word.upper()]))
+        texts.append(" ".join(words))
+    return texts
+
+
+@pytest.mark.parametrize("text", content_texts())
+def test_matches_baseline_on_content_json(text, baseline):
+    assert bold_mask(gr.format_text_with_bold_tech(text)) == bold_mask(baseline(text))
+
+
+def test_matches_baseline_on_synthetic_text(all_terms, baseline):
+    for text in synthetic_texts(all_terms):
+        assert bold_mask(gr.format_text_with_bold_tech(text)) == bold_mask(baseline(text)), text
+
+
+@pytest.mark.parametrize("text, expected", [
+    # Longest term wins
+    ("Shipped Spring Boot services", "Shipped <b>Spring Boot</b> services"),
+    ("Spring and Spring Boot", "<b>Spring</b> and <b>Spring Boot</b>"),
+    ("Forms in React Hook Form", "Forms in <b>React Hook Form</b>"),
+    ("JavaScript, not Java", "<b>JavaScript</b>, not <b>Java</b>"),
+    # Any case matches, and the text keeps its own spelling
+    ("python and PYTHON and Python", "<b>python</b> and <b>PYTHON</b> and <b>Python</b>"),
+    ("spring boot", "<b>spring boot</b>"),
+    # Word boundaries next to punctuation
+    ("(Python), AWS; Go.", "(<b>Python</b>), <b>AWS</b>; <b>Go</b>."),
+    ("C++/C# and .NET", "<b>C++</b>/<b>C#</b> and <b>.NET</b>"),
+    ("Node.js: CI/CD!", "<b>Node.js</b>: <b>CI/CD</b>!"),
+    ("Pythonic Gopher AWSome", "Pythonic Gopher AWSome"),
+    # Existing <b> runs and other tags are left alone
+    ("<b>Python</b> and Go", "<b>Python</b> and <b>Go</b>"),
+    ("<b>Kubernetes clusters</b> on AWS", "<b>Kubernetes clusters</b> on <b>AWS</b>"),
+    # Aliases are bolded as written
+    ("Ran K8s on Amazon Web Services", "Ran <b>K8s</b> on <b>Amazon Web Services</b>"),
+])
+def test_targeted_cases(text, expected, baseline):
+    assert gr.format_text_with_bold_tech(text) == expected
+    assert bold_mask(expected) == bold_mask(baseline(text))
+
+
+def test_markup_attributes_are_not_highlighted(baseline):
+    # The old loop bolded "go" inside the href, breaking the tag
+    text = "<a href='https://go.dev'>Go site</a>"
+    assert gr.format_text_with_bold_tech(text) == "<a href='https://go.dev'><b>Go</b> site</a>"
+    assert "<b>go</b>" in baseline(text)
+
+
+def test_no_nested_bold():
+    # The old loop produced <b><b>React</b> Hook Form</b> here
+    assert "<b><b>" not in gr.format_text_with_bold_tech("React Hook Form and React")
+
+
+def test_text_without_terms_is_unchanged():
+    text = "Led a team of five & reduced costs by 30%"
+    assert gr.format_text_with_bold_tech(text) == text
+
+
+@pytest.mark.parametrize("text, expected", [
+    # Characters re.IGNORECASE folds to an ASCII letter still match
+    ("Ran Kubernetes", "Ran <b>Kubernetes</b>"),
+    ("Javaſcript, not Javaſ", "<b>Javaſcript</b>, not Javaſ"),
+])
+def test_case_folded_letters(text, expected, baseline):
+    assert gr.format_text_with_bold_tech(text) == expected
+    assert bold_mask(expected) == bold_mask(baseline(text))
+
+
+def test_index_loads_without_compiling(tmp_path, monkeypatch):
+    monkeypatch.setattr(gr, "TERM_INDEX_DIR", str(tmp_path))
+    built = gr.load_term_index([gr.BASE_TERMS_PATH])
+    loaded = gr.load_term_index([gr.BASE_TERMS_PATH])
+    assert not built.cached and loaded.cached
+    assert loaded.terms == built.terms and loaded.matcher.table == built.matcher.table
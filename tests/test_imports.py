@@ -0,0 +1,22 @@
+"""
+Import-time budget of generate_resume and the commands that must stay
+light. Both run in fresh interpreters, as benchmark.py --import-only does.
+"""
+
+import pytest
+
+import benchmark
+
+
+def test_import_within_budget():
+    import_ms = benchmark.measure_import_time()
+    assert import_ms <= benchmark.IMPORT_BUDGET_MS, (
+        f"import generate_resume took {import_ms:.1f}ms (budget {benchmark.IMPORT_BUDGET_MS:.1f}ms)"
+    )
+
+
+@pytest.mark.parametrize("command", benchmark.LIGHT_COMMANDS, ids=" ".join)
+def test_light_command_skips_reportlab_and_matcher(command):
+    built_matcher, loaded_reportlab = benchmark.probe_command(command)
+    assert not loaded_reportlab, f"'{' '.join(command)}' imported ReportLab"
+    assert not built_matcher, f"'{' '.join(command)}' built the tech term matcher"
@@ -0,0 +1,57 @@
+"""
+SkillIndex.query with --audience counts what that audience's resume shows.
+"""
+
+import copy
+import json
+import os
+
+import pytest
+
+import generate_resume as gr
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def data():
+    with open(os.path.join(ROOT, "content.json"), encoding="utf-8") as f:
+        data = json.load(f)
+    data = copy.deepcopy(data)
+    data["summary"] = [
+        {"text": "Kubernetes platform engineer", "target_audiences": ["backend"]},
+        {"text": "Go generalist"},
+    ]
+    return data
+
+
+@pytest.fixture
+def skill_index(tmp_path, data):
+    path = tmp_path / "candidate.json"
+    path.write_text(json.dumps(data), encoding="utf-8")
+    with gr.SkillIndex(str(tmp_path / "index.sqlite")) as index:
+        assert index.refresh(str(path)) == ("indexed", None)
+        yield index
+
+
+def summary_terms(index, term, audience):
+    matches = index.query([term], audience)
+    return bool(matches) and "summary" in matches[0]["terms"][term]
+
+
+@pytest.mark.parametrize("audience", ["backend", "devops", "frontend", "nobody", None])
+def test_summary_follows_the_rendered_selection(skill_index, data, audience):
+    content = gr.build_content(data)
+    shown = [content.summary[pos].text for pos in content.index.selection(audience)[0]]
+    for term in ("Kubernetes", "Go"):
+        visible = any(term in text for text in shown) or (
+            audience is None and any(term in item.text for item in content.summary)
+        )
+        assert summary_terms(skill_index, term, audience) == visible, (term, shown)
+
+
+def test_backend_summary_is_not_counted_for_devops(skill_index):
+    assert summary_terms(skill_index, "Kubernetes", "backend")
+    assert not summary_terms(skill_index, "Kubernetes", "devops")
+    assert summary_terms(skill_index, "Go", "devops")
+    assert not summary_terms(skill_index, "Go", "backend")